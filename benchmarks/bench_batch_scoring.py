@@ -0,0 +1,64 @@
+# benchmarks/bench_batch_scoring.py
+#
+# Re-score N historical patients: scalar priority_at() loop vs priority_batch().
+# Run from the repo root:  python -m benchmarks.bench_batch_scoring [rows]
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from core.patient import Patient
+from core.priority import priority_at
+from core.priority_batch import columns_from_patients, priority_batch
+
+
+def random_patients(n, seed=7):
+    """Patients with random vitals, some missing, arriving over one day."""
+    rng = random.Random(seed)
+    maybe = lambda lo, hi: rng.choice([None, rng.randint(lo, hi)])
+    start = datetime(2025, 1, 1, 8, 0)
+    symptoms = ["Chest Pain", "Fracture", "Dizziness", "High Fever", "Vomiting"]
+
+    return [
+        Patient(
+            id=i, first_name="P", last_name=str(i), phone="",
+            age=rng.randint(0, 120),
+            symptoms=rng.sample(symptoms, rng.randint(0, 4)),
+            pain_level=rng.choice([rng.randint(0, 10), round(rng.uniform(0, 10), 1)]),
+            is_code_stroke=rng.random() < 0.1,
+            temperature=rng.choice([None, round(rng.uniform(33, 42), 1)]),
+            heart_rate=maybe(30, 180),
+            respiratory_rate=maybe(5, 40),
+            bp_systolic=maybe(60, 220),
+            arrival_time=start + timedelta(seconds=rng.randint(0, 86400)),
+        )
+        for i in range(n)
+    ]
+
+
+def main(n=100_000):
+    patients = random_patients(n)
+    now = datetime(2025, 1, 2)
+
+    start = time.perf_counter()
+    scalar = [priority_at(p, now) for p in patients]
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cols = columns_from_patients(patients)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = priority_batch(cols, now)
+    score_s = time.perf_counter() - start
+
+    assert batch.tolist() == scalar
+    print(f"rows:                 {n:,}")
+    print(f"scalar loop:          {scalar_s:8.3f}s")
+    print(f"batch (build columns) {build_s:8.3f}s")
+    print(f"batch (score)         {score_s:8.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,52 @@
+# benchmarks/bench_bulk_insert.py
+#
+# Single-row insert_patient() vs insert_patients_many() throughput.
+# Run from the repo root:  python -m benchmarks.bench_bulk_insert [rows]
+
+import os
+import sys
+import tempfile
+import time
+
+import database
+from database import init_database, insert_patient, insert_patients_many
+
+
+def make_rows(n):
+    return [{
+        "first_name": f"Drill{i}", "last_name": "MCI", "phone": f"555-{i:07d}",
+        "age": 20 + i % 70, "symptoms": "Fracture,Head Injury", "duration": "1 hour",
+        "pain_level": i % 11, "is_pregnant": 0, "mobility_issues": 0, "stroke_alert": 0,
+        "symptom_score": 13, "age_weight": 0, "pain_weight": 1.5 * (i % 11),
+        "overall_priority": 13 + 1.5 * (i % 11), "status": "Waiting",
+        "arrival_time": "2025-01-01T12:00:00",
+    } for i in range(n)]
+
+
+def timed(label, fn, n):
+    """Run fn against a fresh database file so runs don't share state."""
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_database_path(os.path.join(tmp, "bench.db"))
+        init_database()
+
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+
+        database.close_connections()
+
+    print(f"{label:<28} {n:>7} rows  {elapsed:8.3f}s  {n / elapsed:>10,.0f} rows/s")
+    return elapsed
+
+
+def main(n=5000):
+    rows = make_rows(n)
+
+    single = timed("insert_patient (per row)", lambda: [insert_patient(r) for r in rows], n)
+    bulk = timed("insert_patients_many", lambda: insert_patients_many(rows), n)
+
+    print(f"speedup: {single / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,94 @@
+# benchmarks/bench_dashboard_refresh.py
+#
+# Websocket bytes and server time per queue-dashboard refresh on a
+# 300-card board: tear-down-and-rebuild (the old @ui.refreshable) vs the
+# keyed PatientCards diff. Payload is the JSON NiceGUI's outbox would emit.
+# Run from the repo root:  python -m benchmarks.bench_dashboard_refresh [cards]
+
+import json
+import sys
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from nicegui import Client, ui
+from nicegui.outbox import deleted
+from nicegui.page import page
+
+from core.patient import Patient
+from core.priority import queue_key
+from core.priority_batch import columns_from_patients, priority_batch
+from queue_dashboard import PatientCards, create_patient_card
+
+
+def make_patients(n):
+    start = datetime(2025, 1, 1, 8, 0)
+    return [
+        Patient(
+            id=i + 1, first_name=f"Bench{i}", last_name="Patient", phone=str(i),
+            age=20 + i % 60, symptoms=["Chest Pain"] if i % 7 == 0 else ["Fever"],
+            pain_level=i % 10, heart_rate=70 + i % 50, temperature=37.0,
+            bp_systolic=120, bp_diastolic=80, respiratory_rate=16,
+            status="Waiting", arrival_time=start + timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+
+
+def ordered(patients, now):
+    patients = sorted(patients, key=lambda p: (-queue_key(p), p.id))
+    return patients, priority_batch(columns_from_patients(patients), now)
+
+
+def payload_bytes(client):
+    updates = client.outbox.updates
+    data = {k: None if v is deleted else v._to_dict() for k, v in updates.items()}
+    updates.clear()
+    return len(json.dumps(data, default=str).encode())
+
+
+def rebuild(container, patients, scores):
+    container.clear()
+    with container:
+        for p, score in zip(patients, scores):
+            create_patient_card(p, lambda: None, float(score))
+
+
+def measure(label, client, render, scenarios):
+    for name, (patients, scores) in scenarios:
+        start = time.perf_counter()
+        with client:
+            render(patients, scores)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<10} {name:<22} {payload_bytes(client):>10,} bytes  {elapsed * 1000:>8.1f} ms")
+
+
+def main(n=300):
+    base = make_patients(n)
+    now = datetime(2025, 1, 1, 14, 0)
+
+    edited = list(base)
+    edited[n // 2] = replace(edited[n // 2], pain_level=10, heart_rate=140)
+
+    scenarios = [
+        ("one patient re-triaged", ordered(edited, now)),
+        ("aging tick (+4 min)", ordered(edited, now + timedelta(minutes=4))),
+        ("no change", ordered(edited, now + timedelta(minutes=4))),
+    ]
+    print(f"cards: {n}")
+
+    for label in ("rebuild", "keyed"):
+        client = Client(page("/"), request=None)
+        with client:
+            container = ui.column()
+        cards = PatientCards(container, lambda: None)
+        render = (lambda p, s: rebuild(container, p, s)) if label == "rebuild" else cards.sync
+
+        with client:
+            render(*ordered(base, now))
+        payload_bytes(client)
+        measure(label, client, render, scenarios)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,56 @@
+# benchmarks/bench_patient_decode.py
+#
+# Memory per Patient and rows/sec decode for a 10k-row fetch,
+# validated Patient.from_db_row vs Patient.from_db_row_trusted.
+# Run from the repo root:  python -m benchmarks.bench_patient_decode [rows]
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import database
+from core.patient import Patient
+from database import get_connection, init_database, insert_patients_many
+from benchmarks.bench_bulk_insert import make_rows
+
+
+def measure(label, decode, rows):
+    n = len(rows)
+
+    best = float("inf")
+    for _ in range(7):  # best of 7 to damp scheduler noise
+        start = time.perf_counter()
+        patients = [decode(r) for r in rows]
+        best = min(best, time.perf_counter() - start)
+    rate = n / best
+    del patients
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    patients = [decode(r) for r in rows]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print(f"{label:<24} {rate:>10,.0f} rows/s   {used / n:>7,.0f} bytes/patient")
+    return patients
+
+
+def main(n=10_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        database.set_database_path(os.path.join(tmp, "bench.db"))
+        init_database()
+        insert_patients_many(make_rows(n))
+        rows = get_connection().execute("SELECT * FROM patients;").fetchall()
+
+        print(f"rows: {n:,}  (Patient has __dict__: {hasattr(Patient(None, 'a', 'b', '', 1), '__dict__')})")
+        measure("from_db_row", Patient.from_db_row, rows)
+        if hasattr(Patient, "from_db_row_trusted"):
+            measure("from_db_row_trusted", Patient.from_db_row_trusted, rows)
+
+        database.close_connections()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,48 @@
+# benchmarks/bench_patient_lookup.py
+#
+# Latency of opening one patient (nurse triage route) as the table grows:
+# the old get_all_patients() + linear scan vs the primary-key lookup,
+# cold (cache miss) and warm (LRU hit).
+# Run from the repo root:  python -m benchmarks.bench_patient_lookup
+
+import os
+import random
+import tempfile
+import time
+
+import database
+from database import get_all_patients, get_patient, init_database, insert_patients_many
+from benchmarks.bench_bulk_insert import make_rows
+
+
+def per_call(fn, ids):
+    start = time.perf_counter()
+    for pid in ids:
+        fn(pid)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def scan(pid):
+    return next((x for x in get_all_patients() if x["id"] == pid), None)
+
+
+def main(sizes=(1_000, 10_000, 50_000)):
+    print(f"{'rows':>8} {'full scan':>12} {'pk (cold)':>12} {'pk (cached)':>12}   µs/lookup")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            database.set_database_path(os.path.join(tmp, "bench.db"))
+            init_database()
+            insert_patients_many(make_rows(n))
+            ids = random.Random(1).sample(range(1, n + 1), 100)
+
+            slow = per_call(scan, ids[:5])
+            database._patient_rows.invalidate()
+            cold = per_call(get_patient, ids)
+            warm = per_call(get_patient, ids)
+            print(f"{n:>8,} {slow:>12,.0f} {cold:>12,.1f} {warm:>12,.1f}")
+
+            database.close_connections()
+
+
+if __name__ == "__main__":
+    main()
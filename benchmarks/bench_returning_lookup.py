@@ -0,0 +1,68 @@
+# benchmarks/bench_returning_lookup.py
+#
+# Intake's returning-patient lookup (find_returning_patients) against a
+# large visit history: every person has about three archived visits.
+# Run from the repo root:  python -m benchmarks.bench_returning_lookup [rows]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+import database
+from core.identity import name_key, normalize_phone
+from database import find_returning_patients, get_connection, init_database, transaction
+
+LAST_NAMES = ["Smith", "Garcia", "Okafor", "Nguyen", "Lee", "Novak", "Haddad", "Silva"]
+
+
+def person(k):
+    return f"Name{k}", LAST_NAMES[k % len(LAST_NAMES)], f"555-{k:07d}"
+
+
+def seed_archive(n):
+    people = max(1, n // 3)
+    rows = []
+    for i in range(1, n + 1):
+        k = i % people
+        first, last, phone = person(k)
+        rows.append((
+            i, first, last, phone, 20 + k % 70, "Completed", 1_700_000_000_000 + i * 60_000,
+            normalize_phone(phone), name_key(first, last), k + 1 if i > people else None,
+        ))
+    with transaction() as conn:
+        conn.executemany("""
+            INSERT INTO patients_archive (id, first_name, last_name, phone, age, status,
+                                          arrival_ms, phone_norm, name_key, person_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """, rows)
+    get_connection().execute("ANALYZE;")
+    return people
+
+
+def main(sizes=(10_000, 100_000, 1_000_000)):
+    print(f"{'rows':>10} {'phone+name':>12} {'name only':>12} {'no match':>12}   µs/lookup")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            database.set_database_path(os.path.join(tmp, "bench.db"))
+            init_database()
+            people = seed_archive(n)
+            ks = random.Random(1).sample(range(people), min(people, 500))
+
+            def per_call(args):
+                start = time.perf_counter()
+                for a in args:
+                    find_returning_patients(*a)
+                return (time.perf_counter() - start) / len(args) * 1e6
+
+            both = per_call([(person(k)[2], *person(k)[:2]) for k in ks])
+            name = per_call([("", *person(k)[:2]) for k in ks])
+            miss = per_call([("555-999-0000", "Nobody", f"Here{k}") for k in ks])
+            print(f"{n:>10,} {both:>12,.1f} {name:>12,.1f} {miss:>12,.1f}")
+
+            database.close_connections()
+
+
+if __name__ == "__main__":
+    main(tuple(int(a) for a in sys.argv[1:]) or (10_000, 100_000, 1_000_000))
@@ -0,0 +1,90 @@
+# benchmarks/bench_startup.py
+#
+# Cold-start profile of main.py: a `python -X importtime` breakdown of the
+# slowest top-level imports, main's own [STARTUP] phases (DB init included),
+# and what each deferred route module costs on its first visit.
+# Exits non-zero when cold start exceeds the budget (core/startup.py).
+# Run from the repo root:  python -m benchmarks.bench_startup [top_n]
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+from core.startup import STARTUP_BUDGET_SECONDS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROUTE_MODULES = [
+    "gui.patient_gui",
+    "gui.nurse_gui",
+    "queue_dashboard",
+    "gui.queue_patient_detail",
+    "gui.status_history",
+    "gui.admin_gui",
+]
+
+IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run(code, cwd, importtime=False):
+    # A scratch cwd gives main.py a fresh data/er_triage.db to initialize
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    flags = ["-X", "importtime"] if importtime else []
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True,
+    )
+
+
+def main_imports(stderr, top_n):
+    # Entries are printed children-first; indent is 1 + 2 per nesting level.
+    # main's direct imports are the indent-3 lines since the previous
+    # top-level entry, each with the cumulative cost of its subtree.
+    direct, total = [], None
+    for _, cumulative, indent, name in IMPORTTIME.findall(stderr):
+        if len(indent) == 1:
+            if name == "main":
+                total = int(cumulative)
+                break
+            direct = []
+        elif len(indent) == 3:
+            direct.append((int(cumulative), name))
+    return total, sorted(direct, reverse=True)[:top_n]
+
+
+def main(top_n=10):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "data"))
+
+        result = run("import main", tmp, importtime=True)
+        total_us, slowest = main_imports(result.stderr, top_n)
+
+        print("Slowest direct imports of main.py (cumulative, -X importtime):")
+        for us, name in slowest:
+            print(f"  {us / 1000:8.1f} ms  {name}")
+        print(f"  {total_us / 1000:8.1f} ms  main (total)\n")
+
+        # Without -X importtime, whose own overhead inflates the numbers
+        result = run("import main; print(main.startup.report())", tmp)
+        print("\n".join(l for l in result.stdout.splitlines() if l.startswith("[STARTUP]")))
+
+        match = re.search(r"total\s+([\d.]+) ms", result.stdout)
+        total = float(match.group(1)) / 1000
+
+        print("\nDeferred route imports (paid on first visit):")
+        for module in ROUTE_MODULES:
+            result = run(
+                "import main, time; t = time.perf_counter(); "
+                f"import {module}; print(time.perf_counter() - t)", tmp,
+            )
+            print(f"  {float(result.stdout.split()[-1]) * 1000:8.1f} ms  {module}")
+
+    if total > STARTUP_BUDGET_SECONDS:
+        print(f"\nCold start {total:.2f}s exceeds the {STARTUP_BUDGET_SECONDS:.2f}s budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,86 @@
+# core/archive.py
+#
+# Hot/cold split: completed visits older than ARCHIVE_AFTER_HOURS move,
+# with their status_history rows, into patients_archive and
+# status_history_archive (schema v8). The hot tables stay proportional to
+# the current census; reporting reads both through the all_patients and
+# all_status_history views.
+
+import os
+from typing import List, Optional
+
+from core import async_db, event_bus
+from core.event_bus import bus
+from core.timestamps import now_ms
+from database import transaction
+
+# Completed visits are archived this long after their last status change
+ARCHIVE_AFTER_HOURS = float(os.environ.get("ER_ARCHIVE_AFTER_HOURS", "24"))
+
+# Patients moved per transaction; each batch holds the write lock briefly
+ARCHIVE_BATCH_SIZE = 500
+
+# How often main.py runs the archiver
+ARCHIVE_INTERVAL_SECONDS = 600
+
+
+def _cutoff(max_age_hours: Optional[float]) -> int:
+    hours = ARCHIVE_AFTER_HOURS if max_age_hours is None else max_age_hours
+    return now_ms() - int(hours * 3_600_000)
+
+
+def archive_batch(cutoff: int, batch_size: int = ARCHIVE_BATCH_SIZE) -> List[int]:
+    """Move up to batch_size completed visits finished before cutoff (epoch ms).
+
+    One transaction: the rows and their history leave the hot tables
+    together. Returns the archived ids (empty when nothing is due).
+    """
+    with transaction() as conn:
+        # Finished = last status change (completion), else arrival
+        ids = [r["id"] for r in conn.execute("""
+            SELECT p.id FROM patients p
+            WHERE p.status = 'Completed'
+              AND COALESCE(
+                    (SELECT MAX(h.timestamp_ms) FROM status_history h WHERE h.patient_id = p.id),
+                    p.arrival_ms
+                  ) < ?
+            ORDER BY p.id
+            LIMIT ?;
+        """, (cutoff, batch_size)).fetchall()]
+
+        if ids:
+            placeholders = ", ".join("?" for _ in ids)
+            conn.execute(f"INSERT INTO patients_archive SELECT * FROM patients "
+                         f"WHERE id IN ({placeholders});", ids)
+            conn.execute(f"INSERT INTO status_history_archive SELECT * FROM status_history "
+                         f"WHERE patient_id IN ({placeholders});", ids)
+            conn.execute(f"DELETE FROM status_history WHERE patient_id IN ({placeholders});", ids)
+            conn.execute(f"DELETE FROM patients WHERE id IN ({placeholders});", ids)
+
+    # Gone from the hot table, as far as caches and views are concerned
+    for patient_id in ids:
+        bus.publish(event_bus.DELETE, patient_id)
+    return ids
+
+
+def archive_completed(max_age_hours: Optional[float] = None,
+                      batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Archive everything due, batch by batch; returns the number moved."""
+    cutoff, moved = _cutoff(max_age_hours), 0
+    while True:
+        ids = archive_batch(cutoff, batch_size)
+        moved += len(ids)
+        if len(ids) < batch_size:
+            return moved
+
+
+async def archive_in_background(max_age_hours: Optional[float] = None,
+                                batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """archive_completed() with each batch queued on the writer thread,
+    so intake and triage writes interleave instead of waiting it out."""
+    cutoff, moved = _cutoff(max_age_hours), 0
+    while True:
+        ids = await async_db.write(archive_batch, cutoff, batch_size)
+        moved += len(ids)
+        if len(ids) < batch_size:
+            return moved
@@ -0,0 +1,47 @@
+# core/async_db.py
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Readers run in parallel (WAL lets them proceed during a write); every
+# write goes through one thread, so writers queue in Python instead of
+# spinning on SQLite's busy timeout. Both pools reuse the per-thread
+# pooled connections from database.py.
+READ_WORKERS = 4
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _pool(name: str, workers: int) -> ThreadPoolExecutor:
+    # Created on first use, so the app can shut down and start again (tests)
+    with _pools_lock:
+        if name not in _pools:
+            _pools[name] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"db-{name}")
+        return _pools[name]
+
+
+async def _run(executor, fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+
+async def read(fn, *args, **kwargs):
+    """Await fn(*args, **kwargs) on the reader pool, off the event loop."""
+    return await _run(_pool("read", READ_WORKERS), fn, *args, **kwargs)
+
+
+async def write(fn, *args, **kwargs):
+    """Await fn(*args, **kwargs) on the single writer thread."""
+    return await _run(_pool("write", 1), fn, *args, **kwargs)
+
+
+def shutdown():
+    """Finish queued work and stop the pools (app shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True)
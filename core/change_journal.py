@@ -0,0 +1,130 @@
+# core/change_journal.py
+#
+# Incremental sync on top of the patient_changes journal (schema v6).
+# Triggers on patients and status_history append one row per write with a
+# monotonically increasing version, so a consumer that remembers the last
+# version it saw reads O(changes) instead of the whole table.
+
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from database import get_connection, transaction
+
+# Retention: journal rows older than this, or beyond the newest MAX_ROWS,
+# are pruned. A consumer that falls further behind gets reset=True.
+JOURNAL_RETENTION_HOURS = float(os.environ.get("ER_JOURNAL_RETENTION_HOURS", "24"))
+JOURNAL_MAX_ROWS = int(os.environ.get("ER_JOURNAL_MAX_ROWS", "100000"))
+
+# How often main.py prunes
+JOURNAL_PRUNE_SECONDS = 3600
+
+
+@dataclass
+class ChangeSet:
+    version: int                  # pass back as `since` on the next call
+    rows: List[dict] = field(default_factory=list)     # current rows of changed patients
+    deleted: List[int] = field(default_factory=list)   # ids no longer in patients
+    more: bool = False            # limit reached; call again with .version
+    reset: bool = False           # since predates the journal: reload everything
+
+
+@contextmanager
+def _read_snapshot(conn):
+    # One WAL read transaction: the horizon, the journal and the rows agree
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN;")
+    try:
+        yield conn
+    finally:
+        conn.commit()
+
+
+def _horizon(conn) -> int:
+    # Oldest version still answerable: everything after it is retained.
+    # Pruning deletes from the front only, so the journal has no gaps.
+    row = conn.execute("""
+        SELECT COALESCE(
+            (SELECT MIN(version) - 1 FROM patient_changes),
+            (SELECT seq FROM sqlite_sequence WHERE name='patient_changes'),
+            0
+        );
+    """).fetchone()
+    return row[0]
+
+
+def current_version(conn=None) -> int:
+    """Latest journal version; 0 on a database nothing has been written to."""
+    conn = conn or get_connection()
+    row = conn.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name='patient_changes';"
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def changes_since(since: int, limit: int = 1000) -> ChangeSet:
+    """Patients touched after journal version `since`.
+
+    Each changed patient appears once, with its current row (or in
+    deleted), however many writes it saw. At most `limit` journal entries
+    are consumed per call; more=True means call again. When `since` is
+    older than the retained journal, reset=True: reload the full table,
+    then continue from the returned version.
+    """
+    with _read_snapshot(get_connection()) as conn:
+        if since < _horizon(conn):
+            return ChangeSet(version=current_version(conn), reset=True)
+
+        rows = conn.execute("""
+            WITH batch AS (
+                SELECT version, patient_id FROM patient_changes
+                WHERE version > ?
+                ORDER BY version
+                LIMIT ?
+            ),
+            touched AS (
+                SELECT patient_id, MAX(version) AS version FROM batch GROUP BY patient_id
+            )
+            SELECT t.patient_id AS changed_id, t.version AS changed_version,
+                   (SELECT COUNT(*) FROM batch) AS batch_size, p.*
+            FROM touched t
+            LEFT JOIN patients p ON p.id = t.patient_id
+            ORDER BY t.version;
+        """, (since, limit)).fetchall()
+
+    changes = ChangeSet(version=since)
+    for row in rows:
+        if row["id"] is None:
+            changes.deleted.append(row["changed_id"])
+        else:
+            data = dict(row)
+            for key in ("changed_id", "changed_version", "batch_size"):
+                del data[key]
+            changes.rows.append(data)
+        changes.version = row["changed_version"]
+
+    changes.more = bool(rows) and rows[0]["batch_size"] == limit
+    return changes
+
+
+def prune_changes(max_age_hours: Optional[float] = None,
+                  max_rows: Optional[int] = None) -> int:
+    """Apply the retention policy; returns the number of rows removed."""
+    max_age_hours = JOURNAL_RETENTION_HOURS if max_age_hours is None else max_age_hours
+    max_rows = JOURNAL_MAX_ROWS if max_rows is None else max_rows
+    cutoff_ms = int((time.time() - max_age_hours * 3600) * 1000)
+
+    # Always a prefix of the journal (see _horizon), even if the clock moved
+    with transaction() as conn:
+        removed = conn.execute("""
+            DELETE FROM patient_changes
+            WHERE version <= MAX(
+                COALESCE((SELECT MAX(version) FROM patient_changes WHERE changed_at < ?), 0),
+                COALESCE((SELECT MAX(version) FROM patient_changes), 0) - ?
+            );
+        """, (cutoff_ms, max_rows)).rowcount
+    return removed
@@ -0,0 +1,103 @@
+# core/event_bus.py
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional
+
+# -------------------------------------------------------
+# TOPICS (published by database.py after each commit)
+# -------------------------------------------------------
+INTAKE = "intake"          # new patient(s) registered
+TRIAGE = "triage"          # vitals / stroke flag saved or reset
+ROOM = "room"              # room assigned (moves to In Treatment)
+DISCHARGE = "discharge"    # marked Completed
+STATUS = "status"          # any other manual status change
+DELETE = "delete"          # row removed
+
+ALL_TOPICS = (INTAKE, TRIAGE, ROOM, DISCHARGE, STATUS, DELETE)
+
+
+@dataclass(frozen=True, slots=True)
+class PatientEvent:
+    topic: str
+    patient_id: int
+    row: Optional[Any] = None   # patients row after the write; None on delete
+
+
+class EventBus:
+    """In-process publish/subscribe for patient changes.
+
+    Plain subscribers run synchronously on the publishing thread (keep them
+    cheap). UI code should use subscribe_coalesced(), which hops onto the
+    asyncio loop and batches bursts into a single callback.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: List[tuple] = []
+        # Bumped on every publish: a cheap "has anything changed?" check
+        # (ETags on the JSON API). In-process only, restarts at 0.
+        self.version = 0
+
+    def subscribe(self, fn: Callable[[PatientEvent], None],
+                  topics: Optional[Iterable[str]] = None) -> Callable[[], None]:
+        """Register fn for the given topics (all if None); returns an unsubscribe."""
+        entry = (frozenset(topics) if topics is not None else None, fn)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    def subscribe_coalesced(self, fn: Callable[[List[PatientEvent]], None],
+                            window: float = 0.25,
+                            topics: Optional[Iterable[str]] = None,
+                            loop: Optional[asyncio.AbstractEventLoop] = None) -> Callable[[], None]:
+        """Call fn(events) on the event loop at most once per window.
+
+        The first event of a burst arms a timer; everything published before
+        it fires is delivered together. Safe to publish from any thread.
+        """
+        loop = loop or asyncio.get_running_loop()
+        pending: List[PatientEvent] = []
+        lock = threading.Lock()
+
+        def flush():
+            with lock:
+                events = pending[:]
+                pending.clear()
+            if events:
+                fn(events)
+
+        def on_event(event: PatientEvent):
+            with lock:
+                first = not pending
+                pending.append(event)
+            if first and not loop.is_closed():
+                loop.call_soon_threadsafe(loop.call_later, window, flush)
+
+        return self.subscribe(on_event, topics)
+
+    def publish(self, topic: str, patient_id: int, row=None):
+        event = PatientEvent(topic, patient_id, row)
+        with self._lock:
+            self.version += 1
+            subscribers = list(self._subscribers)
+
+        for topics, fn in subscribers:
+            if topics is not None and topic not in topics:
+                continue
+            try:
+                fn(event)
+            except Exception as e:
+                # A broken subscriber must never fail the write that published
+                print(f"❌ EVENT SUBSCRIBER ERROR ({topic}):", e)
+
+
+# Process-wide bus
+bus = EventBus()
@@ -0,0 +1,36 @@
+# core/identity.py
+#
+# Normalized keys for recognising a returning patient at intake
+# (patients.phone_norm / name_key, schema v11). Visits of one person share
+# person_id: the id of that person's first visit (NULL on the first visit
+# itself), so "every visit of P" is `id = P OR person_id = P`.
+
+import re
+import unicodedata
+from typing import Optional
+
+# Digits kept from a phone number: drops country codes and trunk prefixes
+PHONE_DIGITS = 10
+
+
+def normalize_phone(phone) -> Optional[str]:
+    """Last PHONE_DIGITS digits of a phone number, or None if it has too few."""
+    digits = re.sub(r"\D", "", str(phone or ""))
+    return digits[-PHONE_DIGITS:] if len(digits) >= 7 else None
+
+
+def _fold(text) -> str:
+    # Case, accents, spaces and punctuation don't distinguish people here
+    decomposed = unicodedata.normalize("NFKD", str(text or "").casefold())
+    return "".join(c for c in decomposed if c.isalnum())
+
+
+def name_key(first_name, last_name) -> Optional[str]:
+    """'last|first' folded for matching, or None without both names."""
+    first, last = _fold(first_name), _fold(last_name)
+    return f"{last}|{first}" if first and last else None
+
+
+def person_of(row) -> int:
+    """The person a visit row belongs to."""
+    return row["person_id"] or row["id"]
@@ -2,8 +2,23 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Optional
 
-
-@dataclass
+from core.symptoms import row_symptoms, split_symptoms
+from core.timestamps import from_epoch_ms
+
+# Values for patients columns a projected SELECT left out (see from_projection)
+PROJECTION_DEFAULTS = {
+    "first_name": "", "last_name": "", "phone": "", "age": 0,
+    "symptoms": "", "duration": "", "pain_level": 0,
+    "is_pregnant": 0, "mobility_issues": 0, "stroke_alert": 0,
+    "temperature": None, "bp_systolic": None, "bp_diastolic": None,
+    "heart_rate": None, "respiratory_rate": None, "triage_notes": "",
+    "symptom_score": 0, "age_weight": 0, "pain_weight": 0, "overall_priority": 0,
+    "status": "Waiting", "arrival_time": None, "room": None, "symptom_mask": 0,
+    "arrival_ms": None,
+}
+
+
+@dataclass(slots=True)
 class Patient:
     id: int | None
     first_name: str
@@ -55,13 +70,12 @@ class Patient:
 
         # Convert symptoms from string → list
         if isinstance(self.symptoms, str):
-            self.symptoms = (
-                [s.strip() for s in self.symptoms.split(",")] if self.symptoms else []
-            )
+            self.symptoms = [*split_symptoms(self.symptoms)]
 
         # Normalize status
         valid_statuses = {
             "waiting": "Waiting",
+            "waiting treatment": "Waiting Treatment",
             "in treatment": "In Treatment",
             "treatment": "In Treatment",
             "completed": "Completed",
@@ -150,6 +164,65 @@ class Patient:
             room=row["room"],  # ⭐ NEW ⭐
         )
 
+    # ----------------------------------------------------
+    @staticmethod
+    def from_db_row_trusted(row):
+        """Fast decode for rows this app wrote itself (bulk fetches).
+
+        Skips __post_init__: no range validation and no status normalization,
+        since our writers store canonical values.
+        Only the None -> 0 coercions the scoring code relies on are kept.
+        """
+        p = object.__new__(Patient)
+        p.id = row["id"]
+        p.first_name = row["first_name"]
+        p.last_name = row["last_name"]
+        p.phone = row["phone"]
+        p.age = row["age"] or 0
+
+        # Same list as __post_init__ builds, through a per-text cache
+        p.symptoms = row_symptoms(row)
+        p.duration = row["duration"]
+        p.pain_level = row["pain_level"] or 0
+
+        p.is_pregnant = bool(row["is_pregnant"])
+        p.mobility_issues = bool(row["mobility_issues"])
+        p.is_code_stroke = bool(row["stroke_alert"])
+
+        p.temperature = row["temperature"]
+        p.bp_systolic = row["bp_systolic"]
+        p.bp_diastolic = row["bp_diastolic"]
+        p.heart_rate = row["heart_rate"]
+        p.respiratory_rate = row["respiratory_rate"]
+
+        p.triage_notes = row["triage_notes"]
+
+        p.symptom_score = row["symptom_score"] or 0
+        p.age_weight = row["age_weight"] or 0
+        p.pain_weight = row["pain_weight"] or 0
+        p.overall_priority = row["overall_priority"] or 0
+
+        p.status = row["status"]
+        # Integer epoch ms when present (schema v9), else the ISO text
+        arrival_ms, arrival = row["arrival_ms"], row["arrival_time"]
+        if arrival_ms is not None:
+            p.arrival_time = from_epoch_ms(arrival_ms)
+        else:
+            p.arrival_time = datetime.fromisoformat(arrival) if arrival else datetime.now()
+        p.room = row["room"]
+        return p
+
+    # ----------------------------------------------------
+    @staticmethod
+    def from_projection(row):
+        """Trusted decode of a row that selected only some columns.
+
+        Columns the query left out take the defaults in PROJECTION_DEFAULTS.
+        """
+        values = dict(PROJECTION_DEFAULTS)
+        values.update(zip(row.keys(), row))
+        return Patient.from_db_row_trusted(values)
+
     # ----------------------------------------------------
     @property
     def full_name(self):
@@ -0,0 +1,94 @@
+# core/priority.py
+#
+# Triage priority scoring, split into a time-invariant part and wait-time aging.
+#
+#   score(now) = static_score + WAIT_WEIGHT * (now_minutes - arrival_minutes)
+#              = queue_key    + WAIT_WEIGHT * now_minutes
+#
+# The second term is the same for every patient at a given instant, so ordering
+# by the persisted queue_key is ordering by live score.
+
+from datetime import datetime
+from typing import Optional
+
+from core.timestamps import MS_PER_MINUTE, epoch_ms
+
+WAIT_WEIGHT = 0.25  # points per minute waited
+
+
+def static_score(p) -> float:
+    """Everything in the triage score except waiting time (unrounded)."""
+    score = 0.0
+
+    # --- SYMPTOMS ---
+    if p.symptoms:
+        score += len(p.symptoms) * 2  # +2 per symptom
+
+    # --- TEMPERATURE ---
+    if p.temperature is not None:
+        if p.temperature < 35:
+            score += 6
+        elif p.temperature > 39:
+            score += 4
+
+    # --- HEART RATE ---
+    if p.heart_rate is not None:
+        if p.heart_rate < 50 or p.heart_rate > 120:
+            score += 6
+
+    # --- RESPIRATORY RATE ---
+    if p.respiratory_rate is not None:
+        if p.respiratory_rate < 10 or p.respiratory_rate > 24:
+            score += 8
+
+    # --- BLOOD PRESSURE ---
+    if p.bp_systolic is not None:
+        if p.bp_systolic < 90:
+            score += 10
+        elif p.bp_systolic > 180:
+            score += 6
+
+    # --- PAIN LEVEL ---
+    if p.pain_level is not None:
+        score += p.pain_level * 1.5
+
+    # --- AGE WEIGHT ---
+    if p.age > 65:
+        score += (p.age - 65) * 0.5
+
+    # --- STROKE FLAG ---
+    if p.is_code_stroke:
+        score += 50
+
+    return score
+
+
+def to_minutes(t: datetime) -> float:
+    """Minutes since the Unix epoch (naive datetimes are local time).
+
+    Goes through integer epoch milliseconds, so a datetime and the stored
+    arrival_ms of the same row give bit-identical minutes.
+    """
+    return epoch_ms(t) / MS_PER_MINUTE
+
+
+def queue_key(p) -> float:
+    """Time-invariant ordering key persisted as patients.queue_key."""
+    return static_score(p) - WAIT_WEIGHT * to_minutes(p.arrival_time)
+
+
+def round_score(score: float) -> float:
+    # Round-half-even on score*100, i.e. exactly what np.rint does in the
+    # batch scorer, so scalar and vectorized results match bit for bit.
+    return round(score * 100) / 100
+
+
+def priority_at(p, now: Optional[datetime] = None) -> float:
+    """Live score including wait-time aging, rounded for display."""
+    score = static_score(p)
+
+    if p.arrival_time:
+        wait_minutes = to_minutes(now or datetime.now()) - to_minutes(p.arrival_time)
+        score += wait_minutes * WAIT_WEIGHT
+
+    return round_score(score)
@@ -0,0 +1,106 @@
+# core/priority_batch.py
+#
+# Vectorized twin of core/priority.py for scoring many patients at once
+# (dashboard pages, reporting over historical rows). Every branch of
+# static_score() becomes a boolean mask; terms are added in the same order
+# so results match the scalar function exactly (tests/test_priority_batch.py).
+
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from core.priority import WAIT_WEIGHT, to_minutes
+from core.timestamps import MS_PER_MINUTE
+
+# Column-oriented batch: name -> float64 array, NaN where a vital is missing
+BATCH_COLUMNS = (
+    "age",
+    "pain_level",
+    "temperature",
+    "heart_rate",
+    "respiratory_rate",
+    "bp_systolic",
+    "stroke",
+    "symptom_count",
+    "arrival_minutes",
+)
+
+
+def _column(values) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def columns_from_patients(patients: Iterable) -> Dict[str, np.ndarray]:
+    patients = list(patients)
+    return {
+        "age": _column(p.age for p in patients),
+        "pain_level": _column(p.pain_level for p in patients),
+        "temperature": _column(p.temperature for p in patients),
+        "heart_rate": _column(p.heart_rate for p in patients),
+        "respiratory_rate": _column(p.respiratory_rate for p in patients),
+        "bp_systolic": _column(p.bp_systolic for p in patients),
+        "stroke": _column(int(p.is_code_stroke) for p in patients),
+        "symptom_count": _column(len(p.symptoms) for p in patients),
+        "arrival_minutes": _column(
+            to_minutes(p.arrival_time) if p.arrival_time else None for p in patients
+        ),
+    }
+
+
+def columns_from_rows(rows: Iterable) -> Dict[str, np.ndarray]:
+    """Build a batch straight from patients rows, without Patient objects."""
+    rows = list(rows)
+
+    def arrival(ms):
+        return ms / MS_PER_MINUTE if ms is not None else None
+
+    return {
+        "age": _column(r["age"] or 0 for r in rows),
+        "pain_level": _column(r["pain_level"] or 0 for r in rows),
+        "temperature": _column(r["temperature"] for r in rows),
+        "heart_rate": _column(r["heart_rate"] for r in rows),
+        "respiratory_rate": _column(r["respiratory_rate"] for r in rows),
+        "bp_systolic": _column(r["bp_systolic"] for r in rows),
+        "stroke": _column(r["stroke_alert"] or 0 for r in rows),
+        "symptom_count": _column(
+            r["symptoms"].count(",") + 1 if r["symptoms"] else 0 for r in rows
+        ),
+        "arrival_minutes": _column(arrival(r["arrival_ms"]) for r in rows),
+    }
+
+
+def static_score_batch(cols: Dict[str, np.ndarray]) -> np.ndarray:
+    """static_score() for every row of the batch (unrounded)."""
+    n = len(cols["age"])
+    score = np.zeros(n, dtype=np.float64)
+
+    # NaN compares False, matching the scalar "is not None" guards
+    temp = cols["temperature"]
+    hr = cols["heart_rate"]
+    rr = cols["respiratory_rate"]
+    bp = cols["bp_systolic"]
+    pain = cols["pain_level"]
+    age = cols["age"]
+
+    score += cols["symptom_count"] * 2
+    score += np.where(temp < 35, 6.0, np.where(temp > 39, 4.0, 0.0))
+    score += np.where((hr < 50) | (hr > 120), 6.0, 0.0)
+    score += np.where((rr < 10) | (rr > 24), 8.0, 0.0)
+    score += np.where(bp < 90, 10.0, np.where(bp > 180, 6.0, 0.0))
+    score += np.where(np.isnan(pain), 0.0, pain * 1.5)
+    score += np.where(age > 65, (age - 65) * 0.5, 0.0)
+    score += np.where(cols["stroke"] != 0, 50.0, 0.0)
+
+    return score
+
+
+def priority_batch(cols: Dict[str, np.ndarray], now: Optional[datetime] = None) -> np.ndarray:
+    """priority_at() for every row of the batch, rounded the same way."""
+    score = static_score_batch(cols)
+
+    arrival = cols["arrival_minutes"]
+    wait_minutes = to_minutes(now or datetime.now()) - arrival
+    score = np.where(np.isnan(arrival), score, score + wait_minutes * WAIT_WEIGHT)
+
+    return np.rint(score * 100) / 100
@@ -0,0 +1,107 @@
+# core/priority_index.py
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.patient import Patient
+
+# Statuses kept in memory; Completed visits only ever grow, so they stay in SQLite
+ACTIVE_STATUSES = ("Waiting", "Waiting Treatment", "In Treatment")
+
+
+class PriorityIndex:
+    """In-memory ordering of active patients, one sorted list per status.
+
+    Entries are (-score, id) tuples so a plain ascending list puts the most
+    urgent patient first (ties: earliest id first). Updates are a bisect
+    plus a list insert/delete; reading the top k is a slice.
+    """
+
+    def __init__(self, key: Callable[[Patient], float]):
+        self._key = key
+        self._lock = threading.RLock()
+        self._lists: Dict[str, List[Tuple[float, int]]] = {s: [] for s in ACTIVE_STATUSES}
+        self._entries: Dict[int, Tuple[str, Tuple[float, int]]] = {}
+        self._patients: Dict[int, Patient] = {}
+
+    # -------------------------------------------------------
+    # WRITES
+    # -------------------------------------------------------
+    def load(self, patients: Iterable[Patient]):
+        with self._lock:
+            for lst in self._lists.values():
+                lst.clear()
+            self._entries.clear()
+            self._patients.clear()
+
+            for p in patients:
+                if p.status not in self._lists:
+                    continue
+                entry = (-self._key(p), p.id)
+                self._lists[p.status].append(entry)
+                self._entries[p.id] = (p.status, entry)
+                self._patients[p.id] = p
+
+            for lst in self._lists.values():
+                lst.sort()
+
+    def upsert(self, p: Patient):
+        with self._lock:
+            self._discard(p.id)
+            if p.status not in self._lists:
+                return
+            entry = (-self._key(p), p.id)
+            insort(self._lists[p.status], entry)
+            self._entries[p.id] = (p.status, entry)
+            self._patients[p.id] = p
+
+    def remove(self, patient_id: int):
+        with self._lock:
+            self._discard(patient_id)
+
+    def _discard(self, patient_id: int):
+        found = self._entries.pop(patient_id, None)
+        if found is None:
+            return
+        status, entry = found
+        lst = self._lists[status]
+        del lst[bisect_left(lst, entry)]
+        del self._patients[patient_id]
+
+    # -------------------------------------------------------
+    # READS
+    # -------------------------------------------------------
+    def top(self, status: str = "Waiting", k: Optional[int] = None) -> List[Patient]:
+        """Most urgent first; k=None returns the whole status list."""
+        with self._lock:
+            entries = self._lists.get(status, [])
+            if k is not None:
+                entries = entries[:k]
+            return [self._patients[pid] for _, pid in entries]
+
+    def page(self, status: str, after: Optional[Tuple[float, int]] = None,
+             limit: int = 25) -> List[Tuple[Tuple[float, int], Patient]]:
+        """Up to limit (cursor, patient) pairs strictly after the cursor.
+
+        Cursors are (queue_key, id), the same shape QueueManager.get_page uses.
+        """
+        with self._lock:
+            entries = self._lists.get(status, [])
+            start = 0 if after is None else bisect_right(entries, (-after[0], after[1]))
+            return [
+                ((-neg_key, pid), self._patients[pid])
+                for neg_key, pid in entries[start:start + limit]
+            ]
+
+    def get(self, patient_id: int) -> Optional[Patient]:
+        return self._patients.get(patient_id)
+
+    def count(self, status: str) -> int:
+        return len(self._lists.get(status, []))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, patient_id: int):
+        return patient_id in self._entries
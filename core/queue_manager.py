@@ -1,24 +1,54 @@
 # core/queue_manager.py
 
-from datetime import datetime
-from typing import List, Optional
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
 from core.patient import Patient
-from database import get_connection
-from core.status_logger import log_status_change
+from core.priority import priority_at, queue_key
+from core.priority_index import PriorityIndex, ACTIVE_STATUSES
+from core.event_bus import bus, PatientEvent, DELETE
+from core.symptoms import SYMPTOM_IDS
+from database import get_connection, get_patient_row, transition_status, PATIENT_INSERT_COLUMNS
+
+PATIENT_COLUMNS = {"id", *PATIENT_INSERT_COLUMNS, "queue_key", "symptom_mask", "arrival_ms"}
+
+# What a dashboard card renders and scores (plus queue_key for cursors)
+CARD_COLUMNS = (
+    "id", "first_name", "last_name", "age", "symptoms", "pain_level",
+    "stroke_alert", "temperature", "heart_rate", "bp_systolic", "bp_diastolic",
+    "respiratory_rate", "status", "arrival_ms", "room", "queue_key", "symptom_mask",
+)
+
+# Dashboard sort options: name -> (column, descending). Ties break on id
+# ascending; rows whose sort value is NULL come last.
+SORTS = {
+    "priority": ("queue_key", True),
+    "arrival": ("arrival_ms", False),
+}
 
 
 class QueueManager:
-    def __init__(self):
-        self.conn = get_connection()
+    @property
+    def conn(self):
+        # Pooled per-thread connection, shared with every other module
+        return get_connection()
+
+    @property
+    def priority_index(self) -> PriorityIndex:
+        return get_priority_index()
+
+    def get_snapshot(self):
+        """Shared, versioned view of the active queue (see core/queue_snapshot.py)."""
+        from core.queue_snapshot import get_queue_snapshot
+        return get_queue_snapshot().get()
 
     # -------------------------------------------------------
     # RETURN ALL PATIENTS
     # -------------------------------------------------------
     def fetch_all_patients(self) -> List[Patient]:
         c = self.conn.cursor()
-        c.execute("SELECT * FROM patients ORDER BY arrival_time ASC;")
+        c.execute("SELECT * FROM patients ORDER BY arrival_ms ASC;")
         rows = c.fetchall()
-        return [Patient.from_db_row(r) for r in rows]
+        return [Patient.from_db_row_trusted(r) for r in rows]
 
     # -------------------------------------------------------
     # RETURN ONLY WAITING PATIENTS
@@ -27,72 +57,156 @@ class QueueManager:
         c = self.conn.cursor()
         c.execute("SELECT * FROM patients WHERE status='Waiting';")
         rows = c.fetchall()
-        return [Patient.from_db_row(r) for r in rows]
+        return [Patient.from_db_row_trusted(r) for r in rows]
 
     # -------------------------------------------------------
     # TRIAGE PRIORITY ALGORITHM
     # -------------------------------------------------------
     def calculate_priority(self, p: Patient) -> float:
+        # Static vitals/symptom score + 0.25 per minute waited (core/priority.py)
+        return priority_at(p)
 
-        score = 0.0
+    # -------------------------------------------------------
+    # ORDER WAITING PATIENTS BY PRIORITY
+    # -------------------------------------------------------
+    def get_ordered_queue(self, limit: Optional[int] = None,
+                          status: str = "Waiting") -> List[Patient]:
+        # queue_key is time-invariant, so the index hands back rows pre-sorted
+        c = self.conn.cursor()
+        c.execute("""
+            SELECT * FROM patients
+            WHERE status=?
+            ORDER BY queue_key DESC, id ASC
+            LIMIT ?;
+        """, (status, -1 if limit is None else limit))
+        return [Patient.from_db_row_trusted(r) for r in c.fetchall()]
 
-        # --- SYMPTOMS ---
-        if p.symptoms:
-            score += len(p.symptoms) * 2  # +2 per symptom
+    # -------------------------------------------------------
+    # TOP-K + KEYSET PAGING (most urgent first)
+    # -------------------------------------------------------
+    def get_top(self, k: int, status: Optional[str] = "Waiting") -> List[Patient]:
+        return self.get_page(None, k, status)[0]
 
-        # --- TEMPERATURE ---
-        if p.temperature is not None:
-            if p.temperature < 35:
-                score += 6
-            elif p.temperature > 39:
-                score += 4
+    def get_page(
+        self,
+        after_key: Optional[Tuple[object, int]] = None,
+        limit: int = 25,
+        status: Optional[str] = "Waiting",
+        sort: str = "priority",
+        columns: Sequence[str] = CARD_COLUMNS,
+        symptom: Optional[str] = None,
+    ) -> Tuple[List[Patient], Optional[Tuple[object, int]]]:
+        """One page of patients in sort order, plus the cursor for the next.
 
-        # --- HEART RATE ---
-        if p.heart_rate is not None:
-            if p.heart_rate < 50 or p.heart_rate > 120:
-                score += 6
+        after_key is the (sort value, id) cursor returned by the previous
+        call (None for the first page); the returned cursor is None on the
+        last page. status=None pages across every status; symptom keeps
+        only patients reporting it. Rows read from SQLite carry only
+        `columns`; the rest keep Patient defaults.
+        """
+        if status in ACTIVE_STATUSES and sort == "priority" and symptom is None:
+            entries = self.priority_index.page(status, after_key, limit)
+            patients = [p for _, p in entries]
+            cursor = entries[-1][0] if entries else None
+        else:
+            rows = self.query(status, sort, after_key, limit, columns, symptom)
+            patients = [Patient.from_projection(r) for r in rows]
+            column = SORTS[sort][0]
+            cursor = (rows[-1][column], rows[-1]["id"]) if rows else None
 
-        # --- RESPIRATORY RATE ---
-        if p.respiratory_rate is not None:
-            if p.respiratory_rate < 10 or p.respiratory_rate > 24:
-                score += 8
+        return patients, (cursor if len(patients) == limit else None)
+
+    # -------------------------------------------------------
+    # DASHBOARD QUERY BUILDER
+    # -------------------------------------------------------
+    def query(self, status: Optional[str] = None, sort: str = "priority",
+              after: Optional[Tuple[object, int]] = None, limit: int = 25,
+              columns: Sequence[str] = CARD_COLUMNS,
+              symptom: Optional[str] = None) -> list:
+        """Rows for one dashboard view, filtered, sorted and paged in SQL.
 
-        # --- BLOOD PRESSURE ---
-        if p.bp_systolic is not None:
-            if p.bp_systolic < 90:
-                score += 10
-            elif p.bp_systolic > 180:
-                score += 6
+        Two index range scans instead of one OR (which forces a full sort):
+        rows with a sort value first, then rows where it is NULL, by id.
+        """
+        rows = []
+        if after is None or after[0] is not None:
+            rows = self.conn.execute(
+                *self._build_query(status, sort, after, limit, columns, symptom, nulls=False)
+            ).fetchall()
 
-        # --- PAIN LEVEL ---
-        if p.pain_level is not None:
-            score += p.pain_level * 1.5
+        if len(rows) < limit:
+            rows += self.conn.execute(
+                *self._build_query(status, sort, after, limit - len(rows), columns, symptom,
+                                   nulls=True)
+            ).fetchall()
 
-        # --- AGE WEIGHT ---
-        if p.age > 65:
-            score += (p.age - 65) * 0.5
+        return rows
 
-        # --- STROKE FLAG ---
-        if p.is_code_stroke:
-            score += 50
+    def _build_query(self, status, sort, after, limit, columns, symptom, nulls):
+        if sort not in SORTS:
+            raise ValueError(f"Unknown sort '{sort}'. Expected one of {sorted(SORTS)}")
+        column, descending = SORTS[sort]
 
-        # --- WAITING TIME ---
-        if p.arrival_time:
-            try:
-                arrival = datetime.fromisoformat(p.arrival_time)
-                wait_minutes = (datetime.now() - arrival).total_seconds() / 60
-                score += wait_minutes * 0.25
-            except:
-                pass
+        # Cursors need the sort column and id whatever the caller projects
+        select = list(dict.fromkeys([*columns, "id", column]))
+        unknown = set(select) - PATIENT_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown patients columns: {sorted(unknown)}")
 
-        return round(score, 2)
+        where, params = [], []
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if symptom is not None:
+            if symptom not in SYMPTOM_IDS:
+                raise ValueError(f"Unknown symptom '{symptom}'")
+            # A bit test on the row the status/sort index range already reads
+            where.append("symptom_mask & ? != 0")
+            params.append(1 << SYMPTOM_IDS[symptom])
 
-    # -------------------------------------------------------
-    # ORDER WAITING PATIENTS BY PRIORITY
-    # -------------------------------------------------------
-    def get_ordered_queue(self) -> List[Patient]:
-        patients = self.fetch_waiting_patients()
-        return sorted(patients, key=self.calculate_priority, reverse=True)
+        if nulls:
+            where.append(f"{column} IS NULL")
+            if after is not None and after[0] is None:
+                where.append("id > ?")
+                params.append(after[1])
+            order = "id"
+        elif after is None:
+            where.append(f"{column} IS NOT NULL")
+            order = f"{column} {'DESC' if descending else 'ASC'}, id ASC"
+        else:
+            value, last_id = after
+            where.append(f"{column} {'<=' if descending else '>='} ? "
+                         f"AND NOT ({column} = ? AND id <= ?)")
+            params += [value, value, last_id]
+            order = f"{column} {'DESC' if descending else 'ASC'}, id ASC"
+
+        sql = (f"SELECT {', '.join(select)} FROM patients "
+               f"WHERE {' AND '.join(where)} ORDER BY {order} LIMIT ?;")
+        return sql, (*params, limit)
+
+    def status_counts(self) -> Dict[str, int]:
+        """Patients per status, from one GROUP BY over the status index."""
+        rows = self.conn.execute(
+            "SELECT status, COUNT(*) AS n FROM patients GROUP BY status;"
+        ).fetchall()
+        return {r["status"]: r["n"] for r in rows}
+
+    def symptom_counts(self, status: Optional[str] = "Waiting") -> Dict[str, int]:
+        """Patients per dictionary symptom (status=None: every status).
+
+        Reads the patient_symptoms primary key per symptom rather than
+        scanning the comma-joined text.
+        """
+        rows = self.conn.execute(f"""
+            SELECT s.name, COUNT(p.id) AS n
+            FROM symptoms s
+            JOIN patient_symptoms ps ON ps.symptom_id = s.id
+            JOIN patients p ON p.id = ps.patient_id
+            {"WHERE p.status = ?" if status else ""}
+            GROUP BY s.id
+            ORDER BY s.id;
+        """, (status,) if status else ()).fetchall()
+        return {r["name"]: r["n"] for r in rows}
 
     # -------------------------------------------------------
     # DASHBOARD PATIENTS
@@ -104,26 +218,67 @@ class QueueManager:
     # GET PATIENT BY ID
     # -------------------------------------------------------
     def get_patient_by_id(self, patient_id: int) -> Optional[Patient]:
-        c = self.conn.cursor()
-        c.execute("SELECT * FROM patients WHERE id=?;", (patient_id,))
-        row = c.fetchone()
+        row = get_patient_row(patient_id)
         return Patient.from_db_row(row) if row else None
 
     # -------------------------------------------------------
     # UPDATE STATUS + LOG HISTORY
     # -------------------------------------------------------
     def update_status(self, patient_id: int, new_status: str, notes: str = ""):
-        """Updates patient status AND logs the change in status_history."""
-        c = self.conn.cursor()
+        """Updates patient status AND logs the change in status_history (one commit)."""
+        return transition_status(patient_id, new_status, notes)
+
+
+# -------------------------------------------------------
+# SHARED QUEUE MANAGER (built on first use, not at import)
+# -------------------------------------------------------
+_queue_manager: Optional[QueueManager] = None
+
+
+def get_queue_manager() -> QueueManager:
+    global _queue_manager
+    if _queue_manager is None:
+        _queue_manager = QueueManager()
+    return _queue_manager
+
+
+# -------------------------------------------------------
+# PROCESS-WIDE PRIORITY INDEX
+# -------------------------------------------------------
+_priority_index: Optional[PriorityIndex] = None
+_priority_index_lock = threading.Lock()
+_unsubscribe_index = None
+
+
+def _apply_patient_change(event: PatientEvent):
+    if event.topic == DELETE:
+        _priority_index.remove(event.patient_id)
+    else:
+        _priority_index.upsert(Patient.from_db_row_trusted(event.row))
+
+
+def get_priority_index() -> PriorityIndex:
+    """Loaded from SQLite on first use, then kept current by bus events."""
+    global _priority_index, _unsubscribe_index
+    with _priority_index_lock:
+        if _priority_index is None:
+            index = PriorityIndex(queue_key)
+            placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+            rows = get_connection().execute(
+                f"SELECT * FROM patients WHERE status IN ({placeholders});",
+                ACTIVE_STATUSES,
+            ).fetchall()
+            index.load(Patient.from_db_row_trusted(r) for r in rows)
 
-        # Get the old status
-        c.execute("SELECT status FROM patients WHERE id=?;", (patient_id,))
-        row = c.fetchone()
-        old_status = row["status"] if row else "Unknown"
+            _priority_index = index
+            _unsubscribe_index = bus.subscribe(_apply_patient_change)
+    return _priority_index
 
-        # Update DB
-        c.execute("UPDATE patients SET status=? WHERE id=?;", (new_status, patient_id))
-        self.conn.commit()
 
-        # Log in history
-        log_status_change(patient_id, old_status, new_status, notes)
+def reset_priority_index():
+    """Drop the index so the next use reloads it (e.g. after switching databases)."""
+    global _priority_index, _unsubscribe_index
+    with _priority_index_lock:
+        if _unsubscribe_index:
+            _unsubscribe_index()
+        _priority_index = _unsubscribe_index = None
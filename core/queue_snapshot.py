@@ -0,0 +1,113 @@
+# core/queue_snapshot.py
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.event_bus import bus, PatientEvent
+from core.patient import Patient
+from core.priority_batch import columns_from_patients, priority_batch
+from core.priority_index import PriorityIndex, ACTIVE_STATUSES
+
+
+@dataclass(frozen=True)
+class SnapshotView:
+    """Immutable, pre-scored ordering of the active queue at one version."""
+    version: int
+    built_at: datetime
+    patients: Dict[str, Tuple[Patient, ...]]
+    scores: Dict[str, Tuple[float, ...]]
+    status_counts: Dict[str, int]       # every status, Completed included
+
+    def count(self, status: str) -> int:
+        return len(self.patients.get(status, ()))
+
+    def page(self, status: str, offset: int = 0,
+             limit: Optional[int] = None) -> Tuple[List[Patient], List[float]]:
+        end = None if limit is None else offset + limit
+        return (
+            list(self.patients.get(status, ())[offset:end]),
+            list(self.scores.get(status, ())[offset:end]),
+        )
+
+
+class QueueSnapshot:
+    """One ordered queue shared by every connected dashboard.
+
+    Bus events only mark the snapshot stale; the next reader rebuilds it
+    from the in-memory priority index plus one GROUP BY for the status
+    counts, and every other client reuses that build. Snapshots older
+    than max_age are rebuilt too so the wait-time part of the displayed
+    scores keeps moving.
+    """
+
+    def __init__(self, index: Callable[[], PriorityIndex],
+                 counts: Callable[[], Dict[str, int]], max_age: float = 30):
+        self._index = index
+        self._counts = counts
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._view: Optional[SnapshotView] = None
+        self._stale = True
+        self._built = 0.0
+        self.version = 0
+
+    def invalidate(self, event: Optional[PatientEvent] = None):
+        self._stale = True
+
+    def get(self) -> SnapshotView:
+        with self._lock:
+            expired = time.monotonic() - self._built > self.max_age
+            if self._stale or expired or self._view is None:
+                self._stale = False
+                self._view = self._build()
+                self._built = time.monotonic()
+            return self._view
+
+    def _build(self) -> SnapshotView:
+        index = self._index()
+        now = datetime.now()
+        patients, scores = {}, {}
+
+        for status in ACTIVE_STATUSES:
+            ordered = index.top(status)
+            patients[status] = tuple(ordered)
+            scores[status] = (
+                tuple(priority_batch(columns_from_patients(ordered), now).tolist())
+                if ordered else ()
+            )
+
+        self.version += 1
+        return SnapshotView(self.version, now, patients, scores, self._counts())
+
+
+# -------------------------------------------------------
+# PROCESS-WIDE SNAPSHOT
+# -------------------------------------------------------
+_snapshot: Optional[QueueSnapshot] = None
+_unsubscribe_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_queue_snapshot() -> QueueSnapshot:
+    global _snapshot, _unsubscribe_snapshot
+    from core.queue_manager import QueueManager, get_priority_index
+
+    with _snapshot_lock:
+        if _snapshot is None:
+            # Load (and subscribe) the index first so it has applied an
+            # event before the snapshot is invalidated by that same event
+            get_priority_index()
+            _snapshot = QueueSnapshot(get_priority_index, QueueManager().status_counts)
+            _unsubscribe_snapshot = bus.subscribe(_snapshot.invalidate)
+    return _snapshot
+
+
+def reset_queue_snapshot():
+    global _snapshot, _unsubscribe_snapshot
+    with _snapshot_lock:
+        if _unsubscribe_snapshot:
+            _unsubscribe_snapshot()
+        _snapshot = _unsubscribe_snapshot = None
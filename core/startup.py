@@ -0,0 +1,37 @@
+# core/startup.py
+
+import os
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+# Cold-start budget: process start until the server accepts connections
+STARTUP_BUDGET_SECONDS = float(os.environ.get("ER_STARTUP_BUDGET", "2.0"))
+
+
+class StartupTimer:
+    """Wall-clock phases of app startup, printed as one report."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def report(self, budget: float = STARTUP_BUDGET_SECONDS) -> str:
+        total = self.elapsed
+        lines = [f"[STARTUP] {name:<24} {seconds * 1000:8.1f} ms" for name, seconds in self.phases]
+        status = "OK" if total <= budget else "OVER BUDGET"
+        lines.append(f"[STARTUP] {'total':<24} {total * 1000:8.1f} ms  "
+                     f"(budget {budget * 1000:.0f} ms, {status})")
+        return "\n".join(lines)
@@ -1,23 +1,94 @@
 # core/status_logger.py
 
-from database import get_connection
-from datetime import datetime
+from database import get_connection, transaction
+from datetime import date, datetime, timedelta
+from core.timestamps import day_start_ms, epoch_ms
 
 def log_status_change(patient_id: int, old_status: str, new_status: str, notes: str = ""):
-  
-    conn = get_connection()
-    c = conn.cursor()
-
-    c.execute("""
-        INSERT INTO status_history (patient_id, old_status, new_status, notes, timestamp)
-        VALUES (?, ?, ?, ?, ?);
-    """, (
-        patient_id,
-        old_status,
-        new_status,
-        notes,
-        datetime.now().isoformat()
-    ))
-
-    conn.commit()
-    conn.close()
+
+    now = datetime.now()
+    with transaction() as conn:
+        conn.execute("""
+            INSERT INTO status_history
+                (patient_id, old_status, new_status, notes, timestamp, timestamp_ms)
+            VALUES (?, ?, ?, ?, ?, ?);
+        """, (
+            patient_id,
+            old_status,
+            new_status,
+            notes,
+            now.isoformat(),
+            epoch_ms(now),
+        ))
+
+
+def _as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def history_page(patient_id=None, status=None, since=None, until=None,
+                 after=None, limit=50):
+    """One page of status history (by patient, then time), plus the next cursor.
+
+    Each row carries elapsed_seconds since that patient's previous status
+    change, computed by LAG() in integer milliseconds over only the patients
+    on this page via the (patient_id, timestamp_ms) index; NULL on a
+    patient's first entry. status
+    matches the new status; since/until are inclusive dates. after is the
+    cursor returned by the previous call, and the cursor is None on the
+    last page.
+    """
+    # Deleted patients' history stays hidden, as with the original join
+    where, params = ["EXISTS (SELECT 1 FROM patients p WHERE p.id = patient_id)"], []
+    if patient_id is not None:
+        where.append("patient_id = ?")
+        params.append(patient_id)
+    if status:
+        where.append("new_status = ?")
+        params.append(status)
+    if since:
+        where.append("timestamp_ms >= ?")
+        params.append(day_start_ms(_as_date(since)))
+    if until:
+        where.append("timestamp_ms < ?")
+        params.append(day_start_ms(_as_date(until) + timedelta(days=1)))
+    if after is not None:
+        where.append("(patient_id, timestamp_ms, id) > (?, ?, ?)")
+        params += list(after)
+
+    rows = get_connection().execute(f"""
+        WITH page AS (
+            SELECT id, patient_id, timestamp_ms
+            FROM status_history
+            WHERE {" AND ".join(where)}
+            ORDER BY patient_id, timestamp_ms, id
+            LIMIT ?
+        ),
+        timeline AS (
+            SELECT
+                id,
+                LAG(timestamp_ms) OVER (
+                    PARTITION BY patient_id ORDER BY timestamp_ms, id
+                ) AS previous
+            FROM status_history
+            WHERE patient_id IN (SELECT patient_id FROM page)
+        )
+        SELECT
+            sh.id,
+            sh.patient_id,
+            p.first_name || ' ' || p.last_name AS full_name,
+            sh.old_status,
+            sh.new_status,
+            sh.timestamp,
+            sh.timestamp_ms,
+            sh.notes,
+            (sh.timestamp_ms - t.previous) / 1000.0 AS elapsed_seconds
+        FROM page
+        JOIN status_history sh ON sh.id = page.id
+        JOIN timeline t ON t.id = page.id
+        JOIN patients p ON p.id = sh.patient_id
+        ORDER BY sh.patient_id, sh.timestamp_ms, sh.id;
+    """, (*params, limit)).fetchall()
+
+    last = rows[-1] if len(rows) == limit else None
+    return rows, ((last["patient_id"], last["timestamp_ms"], last["id"]) if last else None)
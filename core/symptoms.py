@@ -0,0 +1,72 @@
+# core/symptoms.py
+#
+# Symptom dictionary. Each symptom owns one bit of patients.symptom_mask
+# (bit = 1 << id, id = position below); the same ids seed the `symptoms`
+# table and the patient_symptoms join table (schema v7). The comma-joined
+# patients.symptoms text is kept as the human-readable copy.
+
+from functools import lru_cache
+from typing import Iterable, Tuple, Union
+
+# --------------------------------------
+# Symptom severity weights (ER realistic)
+# Append only: a symptom's position is its bit in every stored mask.
+# --------------------------------------
+SYMPTOM_WEIGHTS = {
+    "Chest Pain": 10,
+    "Difficulty Breathing": 10,
+    "Stroke Symptoms (FAST)": 10,
+    "Severe Bleeding": 9,
+    "Head Injury": 8,
+    "High Fever": 6,
+    "Fracture": 5,
+    "Abdominal Pain": 4,
+    "Dizziness": 3,
+    "Vomiting": 3,
+    "Minor Cut / Bruise": 1,
+}
+
+SYMPTOM_IDS = {name: i for i, name in enumerate(SYMPTOM_WEIGHTS)}
+
+# Set when the text names a symptom outside the dictionary (older free-text
+# rows); such rows match no dictionary filter on that name.
+OTHER_BIT = 1 << 62
+
+
+def symptom_mask(symptoms: Union[str, Iterable[str]]) -> int:
+    """Bitmask for a list of symptom names or the stored comma-joined text."""
+    if isinstance(symptoms, str):
+        symptoms = symptoms.split(",") if symptoms else ()
+
+    mask = 0
+    for name in symptoms:
+        bit = SYMPTOM_IDS.get(name.strip())
+        mask |= OTHER_BIT if bit is None else 1 << bit
+    return mask
+
+
+@lru_cache(maxsize=None)
+def symptom_names(mask: int) -> Tuple[str, ...]:
+    """Dictionary symptoms set in mask, most severe first."""
+    return tuple(name for name, bit in SYMPTOM_IDS.items() if mask >> bit & 1)
+
+
+@lru_cache(maxsize=None)
+def symptom_score(mask: int) -> float:
+    """Sum of the weights of the dictionary symptoms in mask."""
+    return sum(SYMPTOM_WEIGHTS[name] for name in symptom_names(mask))
+
+
+@lru_cache(maxsize=4096)
+def split_symptoms(text: str) -> Tuple[str, ...]:
+    """Stored comma-joined text as names, in the order they were entered."""
+    return tuple(s.strip() for s in text.split(",")) if text else ()
+
+
+def row_symptoms(row) -> list:
+    """Symptom list of a patients row, as Patient(symptoms=<text>) parses it.
+
+    The mask answers filters, counts and scores; the list keeps the
+    stored order, so it comes from the text (cached per distinct text).
+    """
+    return [*split_symptoms(row["symptoms"])]
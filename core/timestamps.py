@@ -0,0 +1,51 @@
+# core/timestamps.py
+#
+# Integer epoch-millisecond time (patients.arrival_ms and
+# status_history.timestamp_ms, schema v9). The ISO text columns stay for
+# display and older tools; ordering, range filters and wait-time math use
+# the integers.
+#
+# Stored text comes in two flavours: Python isoformat() ("2025-01-01T12:00:00",
+# local time) and SQLite datetime('now') ("2025-01-01 12:00:00", UTC). The
+# separator tells them apart, in Python and in SQL alike.
+
+import time
+from datetime import date, datetime, timezone
+from typing import Optional, Union
+
+MS_PER_MINUTE = 60_000
+
+
+def epoch_ms(value: Union[datetime, str, None]) -> Optional[int]:
+    """Epoch milliseconds for a datetime or stored timestamp text (naive = local)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        parsed = datetime.fromisoformat(value)
+        if "T" not in value and parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        value = parsed
+    return round(value.timestamp() * 1000)
+
+
+def day_start_ms(day: date) -> int:
+    """Epoch milliseconds of local midnight starting `day`."""
+    return epoch_ms(datetime(day.year, day.month, day.day))
+
+
+def now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def from_epoch_ms(ms: int) -> datetime:
+    """Naive local datetime for epoch milliseconds."""
+    return datetime.fromtimestamp(ms / 1000)
+
+
+def sql_epoch_ms(column: str) -> str:
+    """SQL expression equal to epoch_ms() of a text column (triggers, backfill)."""
+    return (
+        f"CAST(ROUND((julianday({column}, "
+        f"CASE WHEN instr({column}, 'T') THEN 'utc' ELSE '+0 seconds' END)"
+        f" - 2440587.5) * 86400000) AS INTEGER)"
+    )
@@ -1,27 +1,132 @@
 import sqlite3
 import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+from core import event_bus
+from core.event_bus import bus
+from core.patient import Patient
+from core.priority import queue_key
+from core.symptoms import SYMPTOM_IDS, SYMPTOM_WEIGHTS, symptom_mask
+from core.timestamps import epoch_ms, sql_epoch_ms
+from core.identity import name_key, normalize_phone, person_of
 
 # Path to SQLite database inside /data folder
 DB_PATH = os.path.join("data", "er_triage.db")
 
+# Applied to every pooled connection (WAL lets readers run alongside the writer)
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,          # ms to wait on a locked database
+    "cache_size": -16000,          # negative = KiB (16 MB page cache)
+    "mmap_size": 128 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
 
 # -----------------------------------------------------------
-# CONNECTION (ensures dict-like row access)
+# CONNECTION MANAGER (one long-lived connection per thread)
 # -----------------------------------------------------------
-def get_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # CRITICAL
-    return conn
+class ConnectionManager:
+    """Hands out pooled, thread-affine SQLite connections.
+
+    Each thread gets its own connection the first time it asks and keeps it
+    for the life of the process, so callers must NOT close what they get.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def _open(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # check_same_thread=False only so close_all() can run from any thread;
+        # thread affinity is enforced by the thread-local lookup below.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # CRITICAL
+        for name, value in PRAGMAS.items():
+            conn.execute(f"PRAGMA {name}={value};")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Run the block in one write transaction (single commit).
+
+        Nested calls join the outer transaction instead of committing early.
+        """
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+_pool = ConnectionManager(DB_PATH)
 
 
 # -----------------------------------------------------------
-# INITIALIZE + MIGRATE DATABASE
+# CONNECTION (ensures dict-like row access)
 # -----------------------------------------------------------
-def init_database():
-    """Initialize database and ensure all required columns exist."""
-    os.makedirs("data", exist_ok=True)
-    conn = get_connection()
+def get_connection() -> sqlite3.Connection:
+    """Pooled connection for the calling thread — do not close it."""
+    return _pool.connection()
+
+
+def transaction():
+    """Context manager yielding the pooled connection inside BEGIN/COMMIT."""
+    return _pool.transaction()
+
+
+def set_database_path(path: str):
+    """Point the pool at another database file (tests, tooling)."""
+    global DB_PATH
+    _pool.close_all()
+    DB_PATH = path
+    _pool.db_path = path
+    _patient_rows.invalidate()
 
+
+def close_connections():
+    _pool.close_all()
+
+
+# -----------------------------------------------------------
+# SCHEMA MIGRATIONS (ordered, tracked in PRAGMA user_version)
+# -----------------------------------------------------------
+def _migrate_base_schema(conn):
+    """v1 — base tables, plus columns missing from pre-versioning files."""
     # Base table creation
     conn.execute("""
     CREATE TABLE IF NOT EXISTS patients (
@@ -101,29 +206,451 @@ def init_database():
     );
     """)
 
-    conn.commit()
-    conn.close()
+
+def _migrate_queue_indexes(conn):
+    """v2 — indexes for the queue, dashboard and history queries."""
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_patients_status_arrival
+        ON patients (status, arrival_time);
+    """)
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_patients_overall_priority
+        ON patients (overall_priority);
+    """)
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_status_history_patient_time
+        ON status_history (patient_id, timestamp);
+    """)
+
+
+def _v1_queue_key(row):
+    # v3's own decode: only v1 columns exist yet, so later decoder
+    # columns must not leak in here
+    try:
+        return queue_key(Patient.from_db_row(row))
+    except (ValueError, TypeError, KeyError):
+        # KeyError: pre-versioning rows missing columns v1 does not add
+        return None
+
+
+def _migrate_queue_key(conn):
+    """v3 — persisted, time-invariant ordering key (see core/priority.py)."""
+    conn.execute("ALTER TABLE patients ADD COLUMN queue_key REAL;")
+
+    rows = conn.execute("SELECT * FROM patients;").fetchall()
+    conn.executemany(
+        "UPDATE patients SET queue_key=? WHERE id=?;",
+        [(_v1_queue_key(dict(r)), r["id"]) for r in rows],
+    )
+
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_patients_status_queue_key
+        ON patients (status, queue_key DESC, id);
+    """)
+
+
+def _migrate_all_status_queue_index(conn):
+    """v4 — priority order across every status (dashboard "All" pages)."""
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_patients_queue_key
+        ON patients (queue_key DESC, id);
+    """)
+
+
+def _migrate_arrival_index(conn):
+    """v5 — arrival order across every status (dashboard "All" by arrival)."""
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_patients_arrival
+        ON patients (arrival_time, id);
+    """)
+
+
+def _migrate_change_journal(conn):
+    """v6 — append-only change journal fed by triggers (core/change_journal.py)."""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS patient_changes (
+        version INTEGER PRIMARY KEY AUTOINCREMENT,
+        patient_id INTEGER NOT NULL,
+        op TEXT NOT NULL,
+        changed_at INTEGER NOT NULL
+            DEFAULT (CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER))
+    );
+    """)
+
+    # op: insert / update / delete on patients, history on a logged transition
+    for name, event, table, ref, op in (
+        ("trg_patients_journal_insert", "INSERT", "patients", "NEW.id", "insert"),
+        ("trg_patients_journal_update", "UPDATE", "patients", "NEW.id", "update"),
+        ("trg_patients_journal_delete", "DELETE", "patients", "OLD.id", "delete"),
+        ("trg_status_history_journal", "INSERT", "status_history", "NEW.patient_id", "history"),
+    ):
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table}
+        BEGIN
+            INSERT INTO patient_changes (patient_id, op) VALUES ({ref}, '{op}');
+        END;
+        """)
+
+
+def _migrate_symptom_mask(conn):
+    """v7 — symptom dictionary, patients.symptom_mask and its join table."""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS symptoms (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        weight REAL NOT NULL
+    );
+    """)
+    conn.executemany(
+        "INSERT OR REPLACE INTO symptoms (id, name, weight) VALUES (?, ?, ?);",
+        [(SYMPTOM_IDS[name], name, weight) for name, weight in SYMPTOM_WEIGHTS.items()],
+    )
+
+    existing_cols = {row["name"] for row in conn.execute("PRAGMA table_info(patients);")}
+    if "symptoms" not in existing_cols:
+        # Pre-versioning files can lack the text column the mask is built from
+        conn.execute("ALTER TABLE patients ADD COLUMN symptoms TEXT DEFAULT '';")
+    conn.execute("ALTER TABLE patients ADD COLUMN symptom_mask INTEGER NOT NULL DEFAULT 0;")
+
+    # One row per (symptom, patient): indexed "who has X" lookups and counts.
+    # Derived from symptom_mask by triggers, so no writer maintains it.
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS patient_symptoms (
+        symptom_id INTEGER NOT NULL,
+        patient_id INTEGER NOT NULL,
+        PRIMARY KEY (symptom_id, patient_id)
+    ) WITHOUT ROWID;
+    """)
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_patient_symptoms_patient
+        ON patient_symptoms (patient_id);
+    """)
+
+    expand = """
+        INSERT INTO patient_symptoms (symptom_id, patient_id)
+        SELECT s.id, NEW.id FROM symptoms s WHERE NEW.symptom_mask >> s.id & 1;
+    """
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_patients_symptoms_insert
+    AFTER INSERT ON patients WHEN NEW.symptom_mask != 0
+    BEGIN {expand} END;
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_patients_symptoms_update
+    AFTER UPDATE OF symptom_mask ON patients
+    WHEN NEW.symptom_mask IS NOT OLD.symptom_mask
+    BEGIN
+        DELETE FROM patient_symptoms WHERE patient_id = OLD.id;
+        {expand}
+    END;
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_patients_symptoms_delete
+    AFTER DELETE ON patients
+    BEGIN
+        DELETE FROM patient_symptoms WHERE patient_id = OLD.id;
+    END;
+    """)
+
+    rows = conn.execute("SELECT id, symptoms FROM patients WHERE symptoms != '';").fetchall()
+    conn.executemany(
+        "UPDATE patients SET symptom_mask=? WHERE id=?;",
+        [(symptom_mask(r["symptoms"]), r["id"]) for r in rows],
+    )
+
+
+def _create_archive_table(conn, source: str, archive: str):
+    # Same columns in the same order as `source`, so rows move with SELECT *
+    # and the union views line up. Ids are kept, never re-assigned.
+    columns = []
+    for col in conn.execute(f"PRAGMA table_info({source});").fetchall():
+        if col["pk"]:
+            columns.append(f"{col['name']} INTEGER PRIMARY KEY")
+            continue
+        definition = f"{col['name']} {col['type']}"
+        if col["notnull"]:
+            definition += " NOT NULL"
+        if col["dflt_value"] is not None:
+            definition += f" DEFAULT {col['dflt_value']}"
+        columns.append(definition)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {archive} ({', '.join(columns)});")
+
+
+def _migrate_archive(conn):
+    """v8 — cold storage for completed visits (core/archive.py).
+
+    Later migrations that add patients/status_history columns must add
+    them to the archive table too, in the same order.
+    """
+    _create_archive_table(conn, "patients", "patients_archive")
+    _create_archive_table(conn, "status_history", "status_history_archive")
+
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_patients_archive_arrival
+        ON patients_archive (arrival_time, id);
+    """)
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_status_history_archive_patient_time
+        ON status_history_archive (patient_id, timestamp);
+    """)
+
+    # Reporting reads hot and archived rows together through these
+    conn.execute("""
+    CREATE VIEW IF NOT EXISTS all_patients AS
+        SELECT * FROM patients
+        UNION ALL
+        SELECT * FROM patients_archive;
+    """)
+    conn.execute("""
+    CREATE VIEW IF NOT EXISTS all_status_history AS
+        SELECT * FROM status_history
+        UNION ALL
+        SELECT * FROM status_history_archive;
+    """)
+
+
+# (table, text column, epoch-ms column) pairs added in v9
+EPOCH_MS_COLUMNS = (
+    ("patients", "arrival_time", "arrival_ms"),
+    ("patients_archive", "arrival_time", "arrival_ms"),
+    ("status_history", "timestamp", "timestamp_ms"),
+    ("status_history_archive", "timestamp", "timestamp_ms"),
+)
+
+
+def _migrate_epoch_ms(conn):
+    """v9 — integer epoch-millisecond twins of the ISO timestamp columns."""
+    for table, text_col, ms_col in EPOCH_MS_COLUMNS:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {ms_col} INTEGER;")
+        conn.execute(f"UPDATE {table} SET {ms_col} = {sql_epoch_ms(text_col)};")
+
+    # Our writers fill the integer column themselves; these triggers cover
+    # rows written with only the text (older tools, hand-run SQL). Archive
+    # rows are copied with theirs.
+    for table, text_col, ms_col in (EPOCH_MS_COLUMNS[0], EPOCH_MS_COLUMNS[2]):
+        derived = sql_epoch_ms(f"NEW.{text_col}")
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_{ms_col}_insert
+        AFTER INSERT ON {table}
+        WHEN NEW.{ms_col} IS NULL AND NEW.{text_col} IS NOT NULL
+        BEGIN
+            UPDATE {table} SET {ms_col} = {derived} WHERE id = NEW.id;
+        END;
+        """)
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_{ms_col}_update
+        AFTER UPDATE OF {text_col} ON {table}
+        WHEN NEW.{ms_col} IS OLD.{ms_col}
+        BEGIN
+            UPDATE {table} SET {ms_col} = {derived} WHERE id = NEW.id;
+        END;
+        """)
+
+    # Integer twins of the text-ordered indexes (v2 status_arrival stays for
+    # older tools ordering by the text column)
+    conn.execute("DROP INDEX IF EXISTS idx_patients_arrival;")
+    conn.execute("DROP INDEX IF EXISTS idx_status_history_patient_time;")
+    conn.execute("DROP INDEX IF EXISTS idx_patients_archive_arrival;")
+    conn.execute("DROP INDEX IF EXISTS idx_status_history_archive_patient_time;")
+    for name, table, columns in (
+        ("idx_patients_status_arrival_ms", "patients", "status, arrival_ms, id"),
+        ("idx_patients_arrival_ms", "patients", "arrival_ms, id"),
+        ("idx_status_history_patient_time_ms", "status_history", "patient_id, timestamp_ms, id"),
+        ("idx_patients_archive_arrival_ms", "patients_archive", "arrival_ms, id"),
+        ("idx_status_history_archive_patient_time_ms", "status_history_archive",
+         "patient_id, timestamp_ms"),
+    ):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns});")
+
+
+# Columns of patients indexed for search, with their bm25 weights
+SEARCH_COLUMNS = {
+    "first_name": 10.0,
+    "last_name": 10.0,
+    "phone": 5.0,
+    "symptoms": 2.0,
+    "triage_notes": 1.0,
+}
+
+
+def _migrate_search_index(conn):
+    """v10 — FTS5 index over names, phone, symptoms and notes (search_patients)."""
+    existing_cols = {row["name"] for row in conn.execute("PRAGMA table_info(patients);")}
+    for col in SEARCH_COLUMNS:
+        if col not in existing_cols:
+            # Pre-versioning files; the archive keeps the same column order
+            for table in ("patients", "patients_archive"):
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} TEXT DEFAULT '';")
+
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"NEW.{c}" for c in SEARCH_COLUMNS)
+    old_values = ", ".join(f"OLD.{c}" for c in SEARCH_COLUMNS)
+
+    # External content: the index stores tokens only, rows stay in patients.
+    # prefix='1 2 3' keeps short as-you-type prefixes to single lookups.
+    conn.execute(f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts USING fts5(
+        {columns},
+        content='patients', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='1 2 3'
+    );
+    """)
+    weights = ", ".join(str(w) for w in SEARCH_COLUMNS.values())
+    conn.execute(
+        "INSERT INTO patients_fts (patients_fts, rank) VALUES ('rank', ?);",
+        (f"bm25({weights})",),
+    )
+
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_patients_fts_insert AFTER INSERT ON patients
+    BEGIN
+        INSERT INTO patients_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+    END;
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_patients_fts_delete AFTER DELETE ON patients
+    BEGIN
+        INSERT INTO patients_fts (patients_fts, rowid, {columns})
+        VALUES ('delete', OLD.id, {old_values});
+    END;
+    """)
+    # Status, room and queue_key writes leave the index alone
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_patients_fts_update
+    AFTER UPDATE OF {columns} ON patients
+    BEGIN
+        INSERT INTO patients_fts (patients_fts, rowid, {columns})
+        VALUES ('delete', OLD.id, {old_values});
+        INSERT INTO patients_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+    END;
+    """)
+
+    conn.execute("INSERT INTO patients_fts (patients_fts) VALUES ('rebuild');")
+
+
+def _migrate_identity(conn):
+    """v11 — normalized phone / name keys and person links (core/identity.py)."""
+    for table in ("patients", "patients_archive"):
+        for col in ("phone_norm TEXT", "name_key TEXT", "person_id INTEGER"):
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {col};")
+
+        rows = conn.execute(f"SELECT id, phone, first_name, last_name FROM {table};").fetchall()
+        conn.executemany(
+            f"UPDATE {table} SET phone_norm=?, name_key=? WHERE id=?;",
+            [(normalize_phone(r["phone"]), name_key(r["first_name"], r["last_name"]), r["id"])
+             for r in rows],
+        )
+
+        # Partial: most lookups hit a handful of rows, and blank keys none
+        for col in ("phone_norm", "name_key"):
+            conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_{table}_{col}
+                ON {table} ({col}, arrival_ms) WHERE {col} IS NOT NULL;
+            """)
+        conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_{table}_person
+            ON {table} (person_id) WHERE person_id IS NOT NULL;
+        """)
+
+
+# (version, description, migration) — append only, never renumber
+MIGRATIONS = [
+    (1, "base schema", _migrate_base_schema),
+    (2, "queue and history indexes", _migrate_queue_indexes),
+    (3, "queue_key ordering column", _migrate_queue_key),
+    (4, "all-status priority index", _migrate_all_status_queue_index),
+    (5, "all-status arrival index", _migrate_arrival_index),
+    (6, "patient change journal", _migrate_change_journal),
+    (7, "symptom dictionary and bitmask", _migrate_symptom_mask),
+    (8, "archive tables and union views", _migrate_archive),
+    (9, "epoch-millisecond timestamps", _migrate_epoch_ms),
+    (10, "full-text patient search", _migrate_search_index),
+    (11, "returning-patient keys", _migrate_identity),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn=None) -> int:
+    conn = conn or get_connection()
+    return conn.execute("PRAGMA user_version;").fetchone()[0]
+
+
+# -----------------------------------------------------------
+# INITIALIZE + MIGRATE DATABASE
+# -----------------------------------------------------------
+def init_database():
+    """Apply pending migrations; a current schema costs one PRAGMA read."""
+    if get_schema_version() >= SCHEMA_VERSION:
+        return
+
+    for version, description, migrate in MIGRATIONS:
+        with transaction() as conn:
+            # Re-check under the write lock in case another process migrated
+            if get_schema_version(conn) >= version:
+                continue
+            print(f"[DB MIGRATION] v{version}: {description}")
+            migrate(conn)
+            conn.execute(f"PRAGMA user_version={version};")
+
+
+# -----------------------------------------------------------
+# QUEUE KEY (kept in sync on every write that changes the score)
+# -----------------------------------------------------------
+def row_queue_key(row):
+    """queue_key for a patients row/mapping; None (sorts last) if unscorable."""
+    try:
+        return queue_key(Patient.from_db_row_trusted(row))
+    except (ValueError, TypeError):
+        return None
+
+
+def _refresh_queue_key(conn, row) -> dict:
+    """Recompute queue_key for an UPDATE ... RETURNING row in the same transaction."""
+    row = dict(row)
+    row["queue_key"] = row_queue_key(row)
+    conn.execute("UPDATE patients SET queue_key=? WHERE id=?;", (row["queue_key"], row["id"]))
+    return row
 
 
 # -----------------------------------------------------------
 # INSERT PATIENT (Used by Intake Form)
 # -----------------------------------------------------------
-def insert_patient(data: dict):
-    conn = get_connection()
 
-    conn.execute("""
-        INSERT INTO patients (
-            first_name, last_name, phone, age,
-            symptoms, duration, pain_level,
-            is_pregnant, mobility_issues, stroke_alert,
-            temperature, bp_systolic, bp_diastolic,
-            heart_rate, respiratory_rate,
-            triage_notes,
-            symptom_score, age_weight, pain_weight, overall_priority,
-            status, arrival_time, room
+# Same column order as Patient.to_db_tuple()
+PATIENT_INSERT_COLUMNS = (
+    "first_name", "last_name", "phone", "age",
+    "symptoms", "duration", "pain_level",
+    "is_pregnant", "mobility_issues", "stroke_alert",
+    "temperature", "bp_systolic", "bp_diastolic",
+    "heart_rate", "respiratory_rate",
+    "triage_notes",
+    "symptom_score", "age_weight", "pain_weight", "overall_priority",
+    "status", "arrival_time", "room",
+)
+
+# Filled by _patient_values from the columns above (person_id: the intake
+# dict's link to an earlier visit, see core/identity.py)
+DERIVED_INSERT_COLUMNS = (
+    "queue_key", "symptom_mask", "arrival_ms", "phone_norm", "name_key", "person_id",
+)
+
+INSERT_PATIENT_SQL = (
+    f"INSERT INTO patients ({', '.join(PATIENT_INSERT_COLUMNS + DERIVED_INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in PATIENT_INSERT_COLUMNS + DERIVED_INSERT_COLUMNS)})"
+)
+
+
+def _patient_values(data) -> tuple:
+    """Row values for INSERT_PATIENT_SQL from an intake dict or a Patient."""
+    if not isinstance(data, dict):
+        return data.to_db_tuple() + (
+            queue_key(data), symptom_mask(data.symptoms), epoch_ms(data.arrival_time),
+            normalize_phone(data.phone), name_key(data.first_name, data.last_name), None,
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
-    """, (
+
+    values = (
         data["first_name"],
         data["last_name"],
         data["phone"],
@@ -147,51 +674,377 @@ def insert_patient(data: dict):
         data.get("status", "Waiting"),
         data["arrival_time"],
         data.get("room")
-    ))
+    )
+    derived = {
+        "symptom_mask": symptom_mask(data["symptoms"]),
+        "arrival_ms": epoch_ms(data["arrival_time"]),
+    }
+    key = row_queue_key({"id": None, **dict(zip(PATIENT_INSERT_COLUMNS, values)), **derived})
+    return values + (
+        key, derived["symptom_mask"], derived["arrival_ms"],
+        normalize_phone(data["phone"]), name_key(data["first_name"], data["last_name"]),
+        data.get("person_id"),
+    )
+
+
+def insert_patient(data: dict) -> int:
+    with transaction() as conn:
+        row = conn.execute(
+            INSERT_PATIENT_SQL + " RETURNING *;", _patient_values(data)
+        ).fetchone()
+
+    bus.publish(event_bus.INTAKE, row["id"], row)
+    return row["id"]
+
+
+# -----------------------------------------------------------
+# BULK INSERT (registration backfill, mass-casualty drills)
+# -----------------------------------------------------------
+def _last_patient_id(conn) -> int:
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name='patients';").fetchone()
+    return row["seq"] if row else 0
+
+
+def insert_patients_many(patients, chunk_size: int = 500) -> list:
+    """Insert an iterable of intake dicts / Patient objects in bulk.
+
+    Rows are streamed through executemany, one transaction per chunk, so
+    memory stays bounded for long feeds. Returns the new ids in input order.
+    """
+    ids = []
+    chunk = []
+
+    def flush():
+        with transaction() as conn:
+            # AUTOINCREMENT hands out seq+1, seq+2, ... while we hold the
+            # write lock, so the chunk's ids are a contiguous range.
+            first = _last_patient_id(conn) + 1
+            conn.executemany(INSERT_PATIENT_SQL, chunk)
+        new_ids = range(first, first + len(chunk))
+        ids.extend(new_ids)
+        chunk.clear()
+
+        rows = conn.execute(
+            "SELECT * FROM patients WHERE id BETWEEN ? AND ?;",
+            (new_ids[0], new_ids[-1]),
+        ).fetchall()
+        for row in rows:
+            bus.publish(event_bus.INTAKE, row["id"], row)
+
+    for item in patients:
+        chunk.append(_patient_values(item))
+        if len(chunk) >= chunk_size:
+            flush()
+
+    if chunk:
+        flush()
+
+    return ids
+
+
+# -----------------------------------------------------------
+# SINGLE-PATIENT LOOKUP (primary key + small LRU cache)
+# -----------------------------------------------------------
+class RowCache:
+    """Thread-safe LRU of patients rows keyed by id.
+
+    Entries are dropped by the bus event every write publishes. A read
+    that overlapped a write is returned but not cached (generation check),
+    so a stale row can never be stored after its invalidation.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = self.misses = 0
+
+    def get(self, key, load):
+        with self._lock:
+            if key in self._rows:
+                self._rows.move_to_end(key)
+                self.hits += 1
+                return self._rows[key]
+            self.misses += 1
+            generation = self._generation
+
+        row = load(key)
+
+        with self._lock:
+            if row is not None and generation == self._generation:
+                self._rows[key] = row
+                if len(self._rows) > self.maxsize:
+                    self._rows.popitem(last=False)
+        return row
+
+    def invalidate(self, key=None):
+        """Drop one id, or everything when key is None."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._rows.clear()
+            else:
+                self._rows.pop(key, None)
+
 
-    conn.commit()
-    conn.close()
+_patient_rows = RowCache()
+bus.subscribe(lambda event: _patient_rows.invalidate(event.patient_id))
+
+
+def _load_patient_row(patient_id: int):
+    return get_connection().execute(
+        "SELECT * FROM patients WHERE id=?;", (patient_id,)
+    ).fetchone()
+
+
+def get_patient_row(patient_id: int):
+    """The patients row for one id (sqlite3.Row, shared, read-only) or None."""
+    return _patient_rows.get(patient_id, _load_patient_row)
+
+
+def get_patient(patient_id: int):
+    """One patient as a dict (same shape as get_all_patients()), or None."""
+    row = get_patient_row(patient_id)
+    return dict(row) if row else None
 
 
 # -----------------------------------------------------------
 # UTILITY FUNCTIONS
 # -----------------------------------------------------------
 def get_all_patients():
-    conn = get_connection()
-    rows = conn.execute("SELECT * FROM patients ORDER BY id DESC;").fetchall()
-    conn.close()
+    rows = get_connection().execute("SELECT * FROM patients ORDER BY id DESC;").fetchall()
     return [dict(r) for r in rows]
 
 
-def update_patient_status(patient_id: int, new_status: str, notes: str = ""):
+def get_patients_page(after_id=None, limit=25, statuses=None):
+    """Newest-first page of patients as dicts, plus the id to continue after.
+
+    Keyset-paged on the primary key, so each page costs the same no matter
+    how many visits the table holds; statuses=None includes every status.
+    The returned cursor is None on the last page.
+    """
+    where, params = [], []
+    if after_id is not None:
+        where.append("id < ?")
+        params.append(after_id)
+    if statuses:
+        where.append(f"status IN ({', '.join('?' for _ in statuses)})")
+        params += list(statuses)
+
+    rows = get_connection().execute(f"""
+        SELECT * FROM patients
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY id DESC
+        LIMIT ?;
+    """, (*params, limit)).fetchall()
+
+    patients = [dict(r) for r in rows]
+    return patients, (patients[-1]["id"] if len(patients) == limit else None)
+
+
+# Queries whose words are all shorter than this search names and phone only:
+# a one- or two-letter prefix matches most notes, and ranking every one of
+# those rows costs far more than the handful of names it finds.
+SEARCH_NOTES_MIN_CHARS = 3
+
+
+def _match_query(text: str) -> str:
+    # Every word must match as a prefix; quoting keeps FTS5 syntax
+    # characters in user input (", *, -, AND ...) from being parsed
+    words = re.findall(r"\w+", text)
+    query = " ".join(f'"{word}"*' for word in words)
+    if words and max(map(len, words)) < SEARCH_NOTES_MIN_CHARS:
+        query = f"{{first_name last_name phone}} : ({query})"
+    return query
+
+
+def search_patients(text: str, limit: int = 25, statuses=None, symptom=None, offset: int = 0):
+    """Best full-text matches for `text` as dicts, most relevant first.
+
+    Matches word prefixes in names, phone, symptoms and triage notes
+    (ranked by bm25, names weighted highest); statuses=None searches
+    every status, and symptom narrows to patients with that dictionary
+    symptom. offset pages through the ranking. An empty query returns
+    no rows.
+    """
+    match = _match_query(text or "")
+    if not match:
+        return []
+
+    where, params = ["patients_fts MATCH ?"], [match]
+    if statuses:
+        where.append(f"p.status IN ({', '.join('?' for _ in statuses)})")
+        params += list(statuses)
+    if symptom is not None:
+        if symptom not in SYMPTOM_IDS:
+            raise ValueError(f"Unknown symptom '{symptom}'")
+        where.append("p.symptom_mask & ? != 0")
+        params.append(1 << SYMPTOM_IDS[symptom])
+
+    rows = get_connection().execute(f"""
+        SELECT p.* FROM patients_fts
+        JOIN patients p ON p.id = patients_fts.rowid
+        WHERE {" AND ".join(where)}
+        ORDER BY patients_fts.rank
+        LIMIT ? OFFSET ?;
+    """, (*params, limit, offset)).fetchall()
+    return [dict(r) for r in rows]
+
+
+# Visits read per key and table before grouping by person; the newest few
+# are enough to name the candidates
+RETURNING_SCAN_LIMIT = 20
+
+_RETURNING_COLUMNS = (
+    "id, person_id, first_name, last_name, phone, age, status, arrival_ms, phone_norm, name_key"
+)
+
+
+def find_returning_patients(phone=None, first_name=None, last_name=None, limit: int = 5):
+    """Earlier visits matching a phone number or name, grouped by person.
+
+    Looks up the normalized keys (core/identity.py) in patients and
+    patients_archive through their partial indexes. Returns one dict per
+    person — person_id, the latest visit's details, visits and which keys
+    matched — phone-and-name matches first, then phone, then name, newest
+    first within each. Without a usable phone or full name, returns [].
+    """
+    phone_norm, key = normalize_phone(phone), name_key(first_name, last_name)
+    if not phone_norm and not key:
+        return []
+
+    branches = [
+        f"SELECT * FROM (SELECT {_RETURNING_COLUMNS} FROM {table} WHERE {column} = :{column} "
+        f"ORDER BY arrival_ms DESC LIMIT :scan)"
+        for table in ("patients", "patients_archive")
+        for column in ("phone_norm", "name_key")
+    ]
     conn = get_connection()
+    rows = conn.execute(" UNION ALL ".join(branches), {
+        "phone_norm": phone_norm, "name_key": key, "scan": RETURNING_SCAN_LIMIT,
+    }).fetchall()
 
-    old_status = conn.execute(
-        "SELECT status FROM patients WHERE id = ?;",
-        (patient_id,)
-    ).fetchone()
+    people = {}
+    for row in rows:
+        person = people.setdefault(person_of(row), {"phone_match": False, "name_match": False})
+        person["phone_match"] |= row["phone_norm"] == phone_norm
+        person["name_match"] |= row["name_key"] == key
+        if (row["arrival_ms"] or 0) > (person.get("last_visit_ms") or -1):
+            person.update(
+                first_name=row["first_name"], last_name=row["last_name"], phone=row["phone"],
+                age=row["age"], status=row["status"], last_visit_ms=row["arrival_ms"],
+            )
 
-    old_status = old_status["status"] if old_status else "Unknown"
+    ranked = sorted(
+        people.items(),
+        key=lambda item: (item[1]["phone_match"] + item[1]["name_match"],
+                          item[1]["phone_match"], item[1]["last_visit_ms"] or 0),
+        reverse=True,
+    )[:limit]
 
-    conn.execute(
-        "UPDATE patients SET status=? WHERE id=?;",
-        (new_status, patient_id),
-    )
+    candidates = []
+    for person_id, person in ranked:
+        visits = conn.execute("""
+            SELECT (SELECT COUNT(*) FROM patients WHERE id = :p OR person_id = :p)
+                 + (SELECT COUNT(*) FROM patients_archive WHERE id = :p OR person_id = :p);
+        """, {"p": person_id}).fetchone()[0]
+        candidates.append({"person_id": person_id, "visits": visits, **person})
+    return candidates
 
-    conn.execute("""
-        INSERT INTO status_history (patient_id, old_status, new_status, notes, timestamp)
-        VALUES (?, ?, ?, ?, datetime('now'));
-    """, (patient_id, old_status, new_status, notes))
 
-    conn.commit()
-    conn.close()
+def update_patient_status(patient_id: int, new_status: str, notes: str = ""):
+    transition_status(patient_id, new_status, notes)
 
 
 def update_stroke_alert(patient_id: int, stroke_flag: int):
-    conn = get_connection()
-    conn.execute(
-        "UPDATE patients SET stroke_alert=? WHERE id=?;",
-        (stroke_flag, patient_id),
-    )
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        row = conn.execute(
+            "UPDATE patients SET stroke_alert=? WHERE id=? RETURNING *;",
+            (stroke_flag, patient_id),
+        ).fetchone()
+        if row:
+            row = _refresh_queue_key(conn, row)
+
+    if row:
+        bus.publish(event_bus.TRIAGE, patient_id, row)
+
+
+def reset_triage(patient_id: int):
+    """Clear recorded vitals and notes so the patient can be re-triaged."""
+    with transaction() as conn:
+        row = conn.execute("""
+            UPDATE patients
+            SET temperature=NULL, bp_systolic=NULL, bp_diastolic=NULL,
+                heart_rate=NULL, respiratory_rate=NULL, triage_notes=''
+            WHERE id=?
+            RETURNING *;
+        """, (patient_id,)).fetchone()
+        if row:
+            row = _refresh_queue_key(conn, row)
+
+    if row:
+        bus.publish(event_bus.TRIAGE, patient_id, row)
+
+
+def delete_patient(patient_id: int):
+    with transaction() as conn:
+        conn.execute("DELETE FROM patients WHERE id=?;", (patient_id,))
+
+    bus.publish(event_bus.DELETE, patient_id)
+
+
+# -----------------------------------------------------------
+# STATUS TRANSITIONS (row update + history in one commit)
+# -----------------------------------------------------------
+
+# Columns a transition may change alongside the status itself
+TRANSITION_COLUMNS = {
+    "room",
+    "stroke_alert",
+    "temperature",
+    "bp_systolic",
+    "bp_diastolic",
+    "heart_rate",
+    "respiratory_rate",
+    "triage_notes",
+    "overall_priority",
+}
+
+
+def transition_status(patient_id: int, new_status: str, notes: str = "",
+                      event: str = event_bus.STATUS, **changes):
+    """Move a patient to new_status and log it in status_history.
+
+    Both writes share one transaction, so history never disagrees with the
+    row. Extra keyword arguments (room, vitals, ...) update the same row.
+    `event` is the bus topic published after the commit.
+    Returns the updated row as a dict, or None if the patient is unknown.
+    """
+    unknown = set(changes) - TRANSITION_COLUMNS
+    if unknown:
+        raise ValueError(f"Cannot update column(s) in a transition: {sorted(unknown)}")
+
+    assignments = ", ".join(["status=?"] + [f"{col}=?" for col in changes])
+
+    with transaction() as conn:
+        # History first: the SELECT still sees the pre-update status
+        now = datetime.now()
+        logged = conn.execute("""
+            INSERT INTO status_history
+                (patient_id, old_status, new_status, notes, timestamp, timestamp_ms)
+            SELECT id, status, ?, ?, ?, ? FROM patients WHERE id=?;
+        """, (new_status, notes, now.isoformat(), epoch_ms(now), patient_id))
+
+        if logged.rowcount == 0:
+            return None
+
+        row = conn.execute(
+            f"UPDATE patients SET {assignments} WHERE id=? RETURNING *;",
+            (new_status, *changes.values(), patient_id),
+        ).fetchone()
+        if changes:
+            row = _refresh_queue_key(conn, row)
+
+    bus.publish(event, patient_id, row)
+    return dict(row)
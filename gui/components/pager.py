@@ -0,0 +1,78 @@
+# gui/components/pager.py
+import asyncio
+import inspect
+
+from nicegui import ui
+
+PAGE_SIZES = [10, 25, 50, 100]
+
+
+class Pager:
+    """Server-side paging controls for long lists.
+
+    Only the visible page is fetched and rendered. fetch(cursor, limit)
+    returns (items, next_cursor), with next_cursor None on the last page,
+    and may be a coroutine function (see core/async_db.py); render(items)
+    draws them. Cursors of earlier pages are kept so Prev re-fetches
+    instead of holding old rows in memory.
+    """
+
+    def __init__(self, fetch, render, page_size: int = 25):
+        self.fetch = fetch
+        self.render = render
+        self.page_size = page_size
+        self._cursors = [None]     # cursor that opens each visited page
+        self._next = None
+        self._loading = asyncio.Lock()   # overlapping loads render in order
+
+        with ui.row().classes('items-center gap-3 my-2'):
+            self._prev_button = ui.button(icon='chevron_left', on_click=self.prev) \
+                .props('flat round')
+            self._label = ui.label().classes('text-sm text-gray-600')
+            self._next_button = ui.button(icon='chevron_right', on_click=self.next) \
+                .props('flat round')
+            ui.select(
+                sorted({*PAGE_SIZES, page_size}), value=page_size, label='Per page',
+                on_change=lambda e: self.set_page_size(e.value),
+            ).classes('w-28')
+
+    @property
+    def page(self) -> int:
+        return len(self._cursors)
+
+    async def load(self):
+        """(Re)fetch the current page, e.g. after the data changed."""
+        async with self._loading:
+            await self._load()
+
+    async def _load(self):
+        result = self.fetch(self._cursors[-1], self.page_size)
+        items, self._next = await result if inspect.isawaitable(result) else result
+
+        # Rows vanished under the cursor (discharged, deleted): step back
+        if not items and len(self._cursors) > 1:
+            self._cursors.pop()
+            return await self._load()
+
+        self.render(items)
+        self._prev_button.set_enabled(len(self._cursors) > 1)
+        self._next_button.set_enabled(self._next is not None)
+        self._label.set_text(f'Page {self.page}')
+
+    async def next(self):
+        if self._next is not None:
+            self._cursors.append(self._next)
+            await self.load()
+
+    async def prev(self):
+        if len(self._cursors) > 1:
+            self._cursors.pop()
+            await self.load()
+
+    async def reset(self):
+        self._cursors = [None]
+        await self.load()
+
+    async def set_page_size(self, size):
+        self.page_size = int(size)
+        await self.reset()
@@ -2,25 +2,30 @@
 
 from nicegui import ui
 from database import (
-    get_all_patients,
-    update_patient_status,
-    update_stroke_alert,
-    DB_PATH,
+    get_patient,
+    get_patients_page,
+    search_patients,
+    transition_status,
+    reset_triage as db_reset_triage,
 )
-from core.queue_manager import QueueManager
-import sqlite3
-import datetime
+from core.queue_manager import get_queue_manager
+from core import async_db
+from core.priority_index import ACTIVE_STATUSES
+from core.symptoms import split_symptoms
+from core.timestamps import MS_PER_MINUTE, from_epoch_ms, now_ms
+from gui.components.pager import Pager
+from core import event_bus
 
-qm = QueueManager()
+
+# Patients per page in the nurse list
+PAGE_SIZE = 25
 
 # ==========================================================
 # UTILITY HELPERS
 # ==========================================================
 
 def clean_symptoms(sym_str):
-    if not sym_str:
-        return []
-    return [s.strip() for s in sym_str.split(",") if s.strip()]
+    return [s for s in split_symptoms(sym_str or "") if s]
 
 
 def triage_badge(p):
@@ -41,75 +46,99 @@ def triage_badge(p):
         ui.label("🟡 Needs Triage").classes("bg-yellow-500 text-white px-3 py-1 rounded-lg text-sm font-bold")
 
 
-def waiting_time(arrival_str):
-    try:
-        t0 = datetime.datetime.fromisoformat(arrival_str)
-        mins = (datetime.datetime.now() - t0).total_seconds() // 60
-        if mins < 60:
-            return f"{int(mins)} min"
-        return f"{int(mins//60)}h {int(mins%60)}m"
-    except:
+def waiting_time(arrival_ms):
+    # Integer math on the stored epoch milliseconds; no string parsing
+    if arrival_ms is None:
         return "Unknown"
+    mins = (now_ms() - arrival_ms) // MS_PER_MINUTE
+    if mins < 60:
+        return f"{mins} min"
+    return f"{mins // 60}h {mins % 60}m"
 
 
 # ==========================================================
 # PATIENT LIST PAGE (Improved UX)
 # ==========================================================
-def nurse_patient_list_page():
+async def nurse_patient_list_page():
 
     ui.markdown("## 🏥 Nurse Triage Panel — Patient List").classes("text-3xl font-bold mb-6")
 
-    patients = get_all_patients()
-
-    if not patients:
-        ui.label("No patients available.").classes("text-gray-500")
-        return
-
-    for p in patients:
-        symptoms = clean_symptoms(p["symptoms"])
-        wait = waiting_time(p["arrival_time"])
-        pr = p["overall_priority"] or 0
-
-        card = ui.row().classes(
-            f"p-5 bg-white shadow hover:shadow-xl cursor-pointer border-l-8 rounded-xl w-full mb-4"
-        )
+    search = ui.input("Search name, phone, symptoms or notes") \
+        .props("clearable debounce=250").classes("w-full")
+
+    # Completed visits pile up forever; list only patients still in the ED
+    show_completed = ui.checkbox("Show completed visits")
+    container = ui.column().classes("w-full")
+
+    async def fetch(cursor, limit):
+        statuses = None if show_completed.value else ACTIVE_STATUSES
+        if (search.value or "").strip():
+            # Best matches first, paged by offset into the ranking
+            offset = cursor or 0
+            rows = await async_db.read(
+                search_patients, search.value, limit, statuses, None, offset
+            )
+            return rows, (offset + limit if len(rows) == limit else None)
+        return await async_db.read(get_patients_page, cursor, limit, statuses)
+
+    def render(patients):
+        container.clear()
+        with container:
+            if not patients:
+                ui.label("No patients available.").classes("text-gray-500")
+            for p in patients:
+                nurse_patient_card(p)
+
+    pager = Pager(fetch, render, PAGE_SIZE)
+    show_completed.on_value_change(lambda _: pager.reset())
+    search.on_value_change(lambda _: pager.reset())
+    await pager.load()
+
+
+def nurse_patient_card(p):
+    symptoms = clean_symptoms(p["symptoms"])
+    wait = waiting_time(p["arrival_ms"])
+    pr = p["overall_priority"] or 0
+
+    card = ui.row().classes(
+        f"p-5 bg-white shadow hover:shadow-xl cursor-pointer border-l-8 rounded-xl w-full mb-4"
+    )
 
-        with card:
-            with ui.column().classes("w-full gap-1"):
+    with card:
+        with ui.column().classes("w-full gap-1"):
 
-                # Name + badge
-                with ui.row().classes("items-center justify-between"):
-                    ui.label(f"{p['first_name']} {p['last_name']}").classes("text-2xl font-bold")
-                    triage_badge(p)
+            # Name + badge
+            with ui.row().classes("items-center justify-between"):
+                ui.label(f"{p['first_name']} {p['last_name']}").classes("text-2xl font-bold")
+                triage_badge(p)
 
-                # Symptoms
-                ui.label(
-                    "Symptoms: " + (", ".join(symptoms) if symptoms else "None")
-                ).classes("text-gray-700 text-sm")
+            # Symptoms
+            ui.label(
+                "Symptoms: " + (", ".join(symptoms) if symptoms else "None")
+            ).classes("text-gray-700 text-sm")
 
-                # Vitals
-                with ui.row().classes("gap-8 text-sm mt-1 text-gray-700"):
-                    ui.label(f"Temp: {p['temperature'] or '--'}°C")
-                    ui.label(f"HR: {p['heart_rate'] or '--'} bpm")
-                    ui.label(f"BP: {(p['bp_systolic'] or '--')}/{p['bp_diastolic'] or '--'}")
-                    ui.label(f"RR: {p['respiratory_rate'] or '--'}")
+            # Vitals
+            with ui.row().classes("gap-8 text-sm mt-1 text-gray-700"):
+                ui.label(f"Temp: {p['temperature'] or '--'}°C")
+                ui.label(f"HR: {p['heart_rate'] or '--'} bpm")
+                ui.label(f"BP: {(p['bp_systolic'] or '--')}/{p['bp_diastolic'] or '--'}")
+                ui.label(f"RR: {p['respiratory_rate'] or '--'}")
 
-                # Footer details
-                with ui.row().classes("gap-10 text-sm text-gray-800 mt-1"):
-                    ui.label(f"Waiting: {wait}")
-                    ui.label(f"Priority: {pr}")
-                    ui.label(f"Status: {p['status']}")
+            # Footer details
+            with ui.row().classes("gap-10 text-sm text-gray-800 mt-1"):
+                ui.label(f"Waiting: {wait}")
+                ui.label(f"Priority: {pr}")
+                ui.label(f"Status: {p['status']}")
 
-        card.on("click", lambda e, pid=p["id"]: ui.navigate.to(f"/nurse/{pid}"))
+    card.on("click", lambda e, pid=p["id"]: ui.navigate.to(f"/nurse/{pid}"))
 
 
 # ==========================================================
 # TRIAGE PAGE ROUTER
 # ==========================================================
-def nurse_triage_page(patient_id):
+async def nurse_triage_page(patient_id):
 
-    patients = get_all_patients()
-    p = next((x for x in patients if x["id"] == patient_id), None)
+    p = await async_db.read(get_patient, patient_id)
 
     if not p:
         ui.label("Patient not found").classes("text-red-600 text-xl")
@@ -154,16 +183,8 @@ def show_readonly_summary_with_retriage(p):
         ui.label(p["triage_notes"] or "None")
 
     # ======= NEW FEATURE: RETRIAGE BUTTON =======
-    def reset_triage():
-        conn = sqlite3.connect(DB_PATH)
-        conn.execute("""
-        UPDATE patients
-        SET temperature=NULL, bp_systolic=NULL, bp_diastolic=NULL,
-            heart_rate=NULL, respiratory_rate=NULL, triage_notes=''
-        WHERE id=?;
-        """, (p["id"],))
-        conn.commit()
-        conn.close()
+    async def reset_triage():
+        await async_db.write(db_reset_triage, p["id"])
 
         ui.notify("Patient triage reset — ready for re-triage", color="blue")
         ui.navigate.to(f"/nurse/{p['id']}")
@@ -231,10 +252,10 @@ def show_editable_triage_form(p):
             triage_notes=notes.value,
             overall_priority=0,
             status="Waiting Treatment",    # always assigned on save
-            arrival_time=datetime.datetime.fromisoformat(p["arrival_time"])
+            arrival_time=from_epoch_ms(p["arrival_ms"]),
         )
 
-        score = qm.calculate_priority(obj)
+        score = get_queue_manager().calculate_priority(obj)
         preview.text = f"Updated Priority: {score}"
         return score
 
@@ -243,27 +264,24 @@ def show_editable_triage_form(p):
         f.on("change", lambda e: recalc())
 
     # SAVE BUTTON (FIXED)
-    def save():
+    async def save():
         score = recalc()
         new_status = "Waiting Treatment"  # ALWAYS after triage
 
-        # Update DB + history
-        update_patient_status(p["id"], new_status, notes.value)
-        update_stroke_alert(p["id"], int(stroke.value))
-
-        conn = sqlite3.connect(DB_PATH)
-        conn.execute("""
-            UPDATE patients
-            SET temperature=?, bp_systolic=?, bp_diastolic=?, heart_rate=?,
-                respiratory_rate=?, triage_notes=?, overall_priority=?,
-                status='Waiting Treatment'
-            WHERE id=?;
-        """, (
-            temp.value, bp_s.value, bp_d.value, hr.value, rr.value,
-            notes.value, score, p["id"]
-        ))
-        conn.commit()
-        conn.close()
+        # Vitals + status + history log in one commit
+        await async_db.write(
+            transition_status,
+            p["id"], new_status, notes.value,
+            event=event_bus.TRIAGE,
+            stroke_alert=int(stroke.value),
+            temperature=temp.value,
+            bp_systolic=bp_s.value,
+            bp_diastolic=bp_d.value,
+            heart_rate=hr.value,
+            respiratory_rate=rr.value,
+            triage_notes=notes.value,
+            overall_priority=score,
+        )
 
         ui.notify("Triage saved — patient moved to treatment queue", color="green")
         ui.navigate.to("/nurse")
@@ -1,27 +1,14 @@
 # patient_gui.py
 from nicegui import ui
 import datetime
-from database import insert_patient
+from database import find_returning_patients, insert_patient
+from core import async_db
+from core.symptoms import SYMPTOM_WEIGHTS, symptom_mask, symptom_score
+from core.timestamps import from_epoch_ms
 
-# --------------------------------------
-# Symptom severity weights (ER realistic)
-# --------------------------------------
-SYMPTOM_WEIGHTS = {
-    "Chest Pain": 10,
-    "Difficulty Breathing": 10,
-    "Stroke Symptoms (FAST)": 10,
-    "Severe Bleeding": 9,
-    "Head Injury": 8,
-    "High Fever": 6,
-    "Fracture": 5,
-    "Abdominal Pain": 4,
-    "Dizziness": 3,
-    "Vomiting": 3,
-    "Minor Cut / Bruise": 1,
-}
 
 def calculate_symptom_score(selected):
-    return sum(SYMPTOM_WEIGHTS[s] for s in selected)
+    return symptom_score(symptom_mask(selected))
 
 def calculate_age_weight(age: int):
     return (age - 65) * 0.5 if age > 65 else 0
@@ -45,11 +32,90 @@ def build_patient_intake_page():
         # PERSONAL INFORMATION
         # --------------------------------------
         ui.label("Personal Information").classes("text-xl font-bold")
-        first_name = ui.input("First Name").classes("w-full")
-        last_name = ui.input("Last Name").classes("w-full mt-2")
-        phone = ui.input("Phone Number").classes("w-full mt-2")
+        first_name = ui.input("First Name").props("debounce=300").classes("w-full")
+        last_name = ui.input("Last Name").props("debounce=300").classes("w-full mt-2")
+        phone = ui.input("Phone Number").props("debounce=300").classes("w-full mt-2")
         age = ui.number("Age", min=0, max=120).classes("w-full mt-2")
 
+        # --------------------------------------
+        # RETURNING PATIENT
+        # Earlier visits with this phone or name; linking stores the
+        # person's id on the new visit instead of starting a new record.
+        # --------------------------------------
+        returning = {"person_id": None, "dismissed": set(), "lookup": 0}
+        returning_box = ui.column().classes("w-full")
+
+        def link_person(candidate):
+            returning["person_id"] = candidate["person_id"]
+            if not age.value and candidate["age"]:
+                age.set_value(candidate["age"])
+            render_returning([candidate])
+
+        def dismiss_person(candidate, candidates):
+            returning["dismissed"].add(candidate["person_id"])
+            if returning["person_id"] == candidate["person_id"]:
+                returning["person_id"] = None
+            render_returning(candidates)
+
+        def render_returning(candidates):
+            shown = [c for c in candidates if c["person_id"] not in returning["dismissed"]]
+            returning_box.clear()
+            with returning_box:
+                for c in shown:
+                    linked = returning["person_id"] == c["person_id"]
+                    matched = " + ".join(k for k in ("phone", "name") if c[f"{k}_match"])
+                    with ui.card().classes("w-full p-3 bg-amber-50"):
+                        ui.label(
+                            "Linked to earlier visits" if linked else "Returning patient?"
+                        ).classes("font-bold")
+                        ui.label(
+                            f"{c['first_name']} {c['last_name']} · {c['phone']} · age {c['age']}"
+                        )
+                        last_visit = (from_epoch_ms(c["last_visit_ms"]).strftime("%Y-%m-%d")
+                                      if c["last_visit_ms"] else "unknown")
+                        ui.label(
+                            f"{c['visits']} visit(s), last {last_visit} ({c['status']}) "
+                            f"· matched on {matched}"
+                        ).classes("text-sm opacity-70")
+                        with ui.row().classes("gap-2"):
+                            if not linked:
+                                ui.button("Link to this patient",
+                                          on_click=lambda c=c: link_person(c)).props("dense")
+                            ui.button("Not this person",
+                                      on_click=lambda c=c: dismiss_person(c, shown)
+                                      ).props("dense flat")
+
+        async def find_candidates():
+            return await async_db.read(
+                find_returning_patients, phone.value, first_name.value, last_name.value
+            )
+
+        async def lookup_returning():
+            returning["lookup"] += 1
+            lookup = returning["lookup"]
+            candidates = await find_candidates()
+            # A newer keystroke's lookup may already have rendered
+            if lookup != returning["lookup"]:
+                return
+
+            # Edited details keep the link only while they still match it
+            still_linked = [c for c in candidates if c["person_id"] == returning["person_id"]]
+            if not still_linked:
+                returning["person_id"] = None
+            render_returning(still_linked or candidates)
+
+        async def confirmed_person_id():
+            # Re-checked at submit: an edit may not have been looked up yet
+            if returning["person_id"] is None:
+                return None
+            candidates = await find_candidates()
+            if any(c["person_id"] == returning["person_id"] for c in candidates):
+                return returning["person_id"]
+            return None
+
+        for field in (first_name, last_name, phone):
+            field.on_value_change(lambda _: lookup_returning())
+
         ui.separator()
 
         # --------------------------------------
@@ -126,7 +192,7 @@ def build_patient_intake_page():
         # --------------------------------------
         # SUBMIT PATIENT
         # --------------------------------------
-        def submit_patient():
+        async def submit_patient():
             try:
                 selected = [sym for sym, box in symptom_checks.items() if box.value]
 
@@ -143,7 +209,7 @@ def build_patient_intake_page():
                     + (50 if "Stroke Symptoms (FAST)" in selected else 0)
                 )
 
-                insert_patient({
+                await async_db.write(insert_patient, {
                     "first_name": first_name.value,
                     "last_name": last_name.value,
                     "phone": phone.value,
@@ -165,7 +231,8 @@ def build_patient_intake_page():
                     "pain_weight": pain_w,
                     "overall_priority": overall_priority,
                     "status": "Waiting",
-                    "arrival_time": datetime.datetime.now().isoformat()
+                    "arrival_time": datetime.datetime.now().isoformat(),
+                    "person_id": await confirmed_person_id(),
                 })
 
                 ui.notify("Patient Registered Successfully!", color="green")
@@ -183,6 +250,8 @@ def build_patient_intake_page():
                 mobility.set_value(False)
                 notes.set_value("")
                 priority_label.text = "Priority Score: 0.0"
+                returning.update(person_id=None, dismissed=set())
+                returning_box.clear()
 
             except Exception as e:
                 print("❌ ERROR:", e)
@@ -1,15 +1,14 @@
 # gui/queue_patient_detail.py
 
 from nicegui import ui
-from core.queue_manager import QueueManager
-from database import get_connection
+from core.queue_manager import get_queue_manager
+from core import async_db
+from database import transition_status
 
-qm = QueueManager()
 
+async def queue_patient_detail_page(patient_id: int):
 
-def queue_patient_detail_page(patient_id: int):
-
-    patient = qm.get_patient_by_id(patient_id)
+    patient = await async_db.read(get_queue_manager().get_patient_by_id, patient_id)
 
     if not patient:
         ui.label("❌ Patient not found").classes("text-red-600 text-xl")
@@ -69,7 +68,7 @@ def queue_patient_detail_page(patient_id: int):
         # ==========================
         # PRIORITY
         # ==========================
-        priority_value = qm.calculate_priority(patient)
+        priority_value = get_queue_manager().calculate_priority(patient)
 
         ui.label("📊 Priority Score").classes("text-xl font-semibold")
         ui.label(f"{priority_value}") \
@@ -87,18 +86,12 @@ def queue_patient_detail_page(patient_id: int):
         ui.label("🔄 Update Patient Status").classes("text-xl font-semibold")
 
         status_select = ui.select(
-            ["Waiting", "In Treatment", "Completed"],
+            ["Waiting", "Waiting Treatment", "In Treatment", "Completed"],
             value=patient.status,
         ).classes("w-1/3")
 
-        def save_status():
-            conn = get_connection()
-            conn.execute(
-                "UPDATE patients SET status=? WHERE id=?",
-                (status_select.value, patient_id),
-            )
-            conn.commit()
-            conn.close()
+        async def save_status():
+            await async_db.write(transition_status, patient_id, status_select.value)
 
             ui.notify("Status updated!", color="green")
             ui.navigate.to("/queue")
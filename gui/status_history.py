@@ -1,8 +1,11 @@
 # gui/status_history.py
 
 from nicegui import ui
-from database import get_connection
-from datetime import datetime
+from core import async_db
+from core.status_logger import history_page
+from core.timestamps import from_epoch_ms
+from gui.components.pager import Pager
+from datetime import timedelta
 
 
 # Translate DB status codes to human workflow statuses
@@ -31,55 +34,28 @@ def format_timedelta(delta):
     return f"{days}d {hours % 24}h"
 
 
-def status_history_page():
+# Log entries per page
+PAGE_SIZE = 50
+
+
+async def status_history_page():
     ui.label("📝 Status History Logs").classes(
         "text-3xl font-bold text-blue-800 mb-6"
     )
 
-    conn = get_connection()
-    c = conn.cursor()
-
-    # Fetch logs sorted by patient AND time
-    c.execute("""
-        SELECT 
-            sh.patient_id,
-            p.first_name || ' ' || p.last_name AS full_name,
-            sh.old_status,
-            sh.new_status,
-            sh.timestamp,
-            sh.notes
-        FROM status_history sh
-        JOIN patients p ON p.id = sh.patient_id
-        ORDER BY sh.patient_id ASC, sh.timestamp ASC;
-    """)
-
-    logs = c.fetchall()
-
-    # Build rows with delta calculations
-    rows = []
-    last_timestamp = {}
-
-    for row in logs:
-        pid = row["patient_id"]
-        current_time = datetime.fromisoformat(row["timestamp"])
-
-        if pid in last_timestamp:
-            delta = format_timedelta(current_time - last_timestamp[pid])
-        else:
-            delta = "—"  # first entry for this patient
-
-        last_timestamp[pid] = current_time
-
-        rows.append({
-            "patient": f"{pid} — {row['full_name']}",
-            "old": map_status_label(row["old_status"]),
-            "new": map_status_label(row["new_status"]),
-            "time": row["timestamp"],
-            "elapsed": delta,
-            "notes": row["notes"] or "",
-        })
-
-    ui.table(
+    # ---- Filters (applied in SQL; only one page is ever fetched) ----
+    with ui.row().classes("gap-4 items-end mb-2"):
+        patient = ui.number("Patient ID", min=1, precision=0).classes("w-32")
+        status = ui.select(
+            {"": "Any status", **{s: map_status_label(s) for s in
+                                  ["Waiting", "Waiting Treatment", "In Treatment", "Completed"]}},
+            value="", label="New status",
+        ).classes("w-48")
+        since = ui.input("From").props("type=date").classes("w-40")
+        until = ui.input("To").props("type=date").classes("w-40")
+        ui.button("Apply", icon="filter_alt", on_click=lambda: pager.reset())
+
+    table = ui.table(
         columns=[
             {"name": "patient", "label": "Patient", "field": "patient"},
             {"name": "old", "label": "Old Status", "field": "old"},
@@ -88,5 +64,35 @@ def status_history_page():
             {"name": "elapsed", "label": "Time Between Statuses", "field": "elapsed"},
             {"name": "notes", "label": "Notes", "field": "notes"},
         ],
-        rows=rows,
+        rows=[],
+        row_key="id",
+        pagination=0,   # paging happens server-side
     )
+
+    async def fetch(cursor, limit):
+        return await async_db.read(
+            history_page,
+            patient_id=int(patient.value) if patient.value else None,
+            status=status.value or None,
+            since=since.value or None,
+            until=until.value or None,
+            after=cursor,
+            limit=limit,
+        )
+
+    def render(logs):
+        table.rows = [{
+            "id": row["id"],
+            "patient": f"{row['patient_id']} — {row['full_name']}",
+            "old": map_status_label(row["old_status"]),
+            "new": map_status_label(row["new_status"]),
+            "time": from_epoch_ms(row["timestamp_ms"]).isoformat(sep=" ", timespec="seconds"),
+            # elapsed_seconds comes from LAG() in SQL; NULL = first entry
+            "elapsed": "—" if row["elapsed_seconds"] is None
+                       else format_timedelta(timedelta(seconds=row["elapsed_seconds"])),
+            "notes": row["notes"] or "",
+        } for row in logs]
+        table.update()
+
+    pager = Pager(fetch, render, PAGE_SIZE)
+    await pager.load()
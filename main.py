@@ -1,26 +1,50 @@
-from nicegui import ui
+import inspect
 
-# GUI imports
-from gui.patient_gui import build_patient_intake_page
-from gui.admin_gui import admin_panel_page
-from gui.nurse_gui import nurse_patient_list_page, nurse_triage_page
-from gui.queue_patient_detail import queue_patient_detail_page
-from gui.status_history import status_history_page
+from core.startup import StartupTimer
 
-# Dashboard (root)
-from queue_dashboard import queue_dashboard_page
+startup = StartupTimer()
+
+with startup.phase("import nicegui"):
+    from nicegui import app, ui
+
+# GUI modules (and numpy, via the dashboard) are imported by their routes on
+# first visit, so they stay off the cold-start path.
 
 # Initialization
-from database import init_database
+with startup.phase("import database"):
+    from database import init_database, close_connections
+    from core import async_db
+    from core.archive import ARCHIVE_INTERVAL_SECONDS, archive_in_background
+    from core.change_journal import JOURNAL_PRUNE_SECONDS, prune_changes
 
 print("🚀 Starting ER Triage & Queue Manager...")
-init_database()
+with startup.phase("init database"):
+    init_database()
 print("[INIT] Database ready.")
 
+# Pooled connections live for the whole process; release them on exit
+# (after the DB thread pools have drained their queued work)
+app.on_shutdown(async_db.shutdown)
+app.on_shutdown(close_connections)
+
+# Apply the change-journal retention policy at startup, then hourly
+app.timer(JOURNAL_PRUNE_SECONDS, lambda: async_db.write(prune_changes))
+
+# Move old completed visits to the archive tables in batches, at startup
+# and then periodically, so the hot tables track the current census
+app.timer(ARCHIVE_INTERVAL_SECONDS, archive_in_background)
+
+# Read-only JSON API for displays and other systems (/api/...)
+from queue_api import router as queue_api_router
+app.include_router(queue_api_router)
+
+# Printed once the server is accepting connections
+app.on_startup(lambda: print(startup.report()))
+
 # -------------------------------------------------------
 # MAIN LAYOUT WRAPPER
 # -------------------------------------------------------
-def layout(page_builder):
+async def layout(page_builder):
     with ui.row().classes("w-full h-full") as root:
 
         # Sidebar
@@ -39,7 +63,10 @@ def layout(page_builder):
 
         # Main Content
         with ui.column().classes("flex-1 p-10 overflow-auto"):
-            page_builder()
+            # Builders that read the database are coroutines (core/async_db.py)
+            built = page_builder()
+            if inspect.isawaitable(built):
+                await built
 
             ui.markdown(
                 "<div style='text-align:center; opacity:0.5; margin-top:50px;'>"
@@ -55,7 +82,7 @@ def layout(page_builder):
 # -------------------------------------------------------
 
 @ui.page("/")
-def home_page():
+async def home_page():
 
     def home_content():
 
@@ -103,49 +130,57 @@ def home_page():
                 ui.button("Open", color="blue",
                           on_click=lambda: ui.navigate.to('/admin')).classes("w-full text-white")
 
-    return layout(home_content)
+    return await layout(home_content)
 
 
 @ui.page("/patient")
-def patient_page():
-    return layout(build_patient_intake_page)
+async def patient_page():
+    from gui.patient_gui import build_patient_intake_page
+    return await layout(build_patient_intake_page)
 
 
 @ui.page("/nurse")
-def nurse_page():
-    return layout(nurse_patient_list_page)
+async def nurse_page():
+    from gui.nurse_gui import nurse_patient_list_page
+    return await layout(nurse_patient_list_page)
 
 
 # Dynamic nurse triage route
 @ui.page("/nurse/{patient_id}")
-def nurse_patient_page(patient_id: int):
-    return layout(lambda: nurse_triage_page(int(patient_id)))
+async def nurse_patient_page(patient_id: int):
+    from gui.nurse_gui import nurse_triage_page
+    return await layout(lambda: nurse_triage_page(int(patient_id)))
 
 
 @ui.page("/queue")
-def queue_page():
-    return layout(queue_dashboard_page)
+async def queue_page():
+    from queue_dashboard import queue_dashboard_page
+    return await layout(queue_dashboard_page)
 
 
 @ui.page("/queue/{patient_id}")
-def queue_detail_page(patient_id: int):
-    return layout(lambda: queue_patient_detail_page(int(patient_id)))
+async def queue_detail_page(patient_id: int):
+    from gui.queue_patient_detail import queue_patient_detail_page
+    return await layout(lambda: queue_patient_detail_page(int(patient_id)))
 
 
 @ui.page("/admin")
-def admin_page():
-    return layout(admin_panel_page)
+async def admin_page():
+    from gui.admin_gui import admin_panel_page
+    return await layout(admin_panel_page)
 
 
 # -------------------------------------------------------
 # STATUS HISTORY ROUTE (NEW)
 # -------------------------------------------------------
 @ui.page("/status_history")
-def status_history_route():
-    return layout(status_history_page)
+async def status_history_route():
+    from gui.status_history import status_history_page
+    return await layout(status_history_page)
 
 
 # -------------------------------------------------------
-# START NICEGUI
+# START NICEGUI (guarded so tooling can import main without serving)
 # -------------------------------------------------------
-ui.run(port=8080, reload=False)
+if __name__ in {"__main__", "__mp_main__"}:
+    ui.run(port=8080, reload=False)
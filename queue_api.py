@@ -0,0 +1,143 @@
+# queue_api.py
+#
+# Read-only JSON endpoints for the bed board, waiting-room displays and
+# paging, so they stop scraping the NiceGUI pages. Mounted by main.py.
+#
+# Every response carries an ETag built from the event bus change version.
+# Pollers send it back in If-None-Match and get an empty 304 without any
+# database work until a patient actually changes. Responses that include
+# live priority scores also fold in the current aging bucket, because
+# waiting time moves the score with no write at all.
+#
+# /api/changes?since=<version> serves deltas from the change journal
+# (core/change_journal.py) for consumers that keep their own copy.
+
+import os
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from core import async_db
+from core.change_journal import changes_since
+from core.event_bus import bus
+from core.priority import priority_at
+
+router = APIRouter(prefix="/api", tags=["queue"])
+
+# Scores gain 0.25 per minute waited; re-send them at most once a minute
+AGING_BUCKET_SECONDS = 60
+
+QueueStatus = Literal["Waiting", "Waiting Treatment", "In Treatment", "Completed"]
+
+# The bus version restarts at 0 with the process; never match a stale tag
+_BOOT = f"{os.getpid():x}{int(time.time()):x}"
+
+
+def _etag(*parts) -> str:
+    return 'W/"' + "-".join(str(p) for p in (_BOOT, *parts)) + '"'
+
+
+def _aging_bucket() -> int:
+    return int(time.time() // AGING_BUCKET_SECONDS)
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    candidates = {t.strip() for t in request.headers.get("if-none-match", "").split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def _json(payload, etag: str) -> JSONResponse:
+    # no-cache: intermediaries may store it but must revalidate every time
+    return JSONResponse(
+        jsonable_encoder(payload),
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
+
+
+def _queue_manager():
+    # Imported on first request, keeping it (and numpy) off main's cold start
+    from core.queue_manager import get_queue_manager
+    return get_queue_manager()
+
+
+def _patient_json(p, now) -> dict:
+    data = asdict(p)
+    data["priority"] = priority_at(p, now)
+    return data
+
+
+# -------------------------------------------------------
+# ORDERED QUEUE
+# -------------------------------------------------------
+@router.get("/queue")
+async def queue(request: Request,
+                status: QueueStatus = "Waiting",
+                limit: int = Query(100, ge=1, le=500)):
+    version = bus.version
+    etag = _etag("queue", status, limit, version, _aging_bucket())
+    if (cached := _not_modified(request, etag)) is not None:
+        return cached
+
+    patients = await async_db.read(_queue_manager().get_ordered_queue, limit, status)
+    now = datetime.now()
+
+    return _json({
+        "status": status,
+        "version": version,
+        "patients": [_patient_json(p, now) for p in patients],
+    }, etag)
+
+
+# -------------------------------------------------------
+# STATUS COUNTS
+# -------------------------------------------------------
+@router.get("/queue/counts")
+async def queue_counts(request: Request):
+    # Counts only change on writes, so the change version alone is enough
+    version = bus.version
+    etag = _etag("counts", version)
+    if (cached := _not_modified(request, etag)) is not None:
+        return cached
+
+    counts = await async_db.read(_queue_manager().status_counts)
+    return _json({"version": version, "counts": counts}, etag)
+
+
+# -------------------------------------------------------
+# SINGLE PATIENT
+# -------------------------------------------------------
+@router.get("/patients/{patient_id}")
+async def patient(request: Request, patient_id: int):
+    etag = _etag("patient", patient_id, bus.version, _aging_bucket())
+    if (cached := _not_modified(request, etag)) is not None:
+        return cached
+
+    p = await async_db.read(_queue_manager().get_patient_by_id, patient_id)
+    if p is None:
+        raise HTTPException(status_code=404, detail="Patient not found")
+
+    return _json(_patient_json(p, datetime.now()), etag)
+
+
+# -------------------------------------------------------
+# INCREMENTAL SYNC (change journal)
+# -------------------------------------------------------
+@router.get("/changes")
+async def changes(since: int = Query(0, ge=0),
+                  limit: int = Query(1000, ge=1, le=5000)):
+    # Keyed by `since`, so there is nothing for an ETag to add
+    result = await async_db.read(changes_since, since, limit)
+    return JSONResponse(jsonable_encoder({
+        "version": result.version,
+        "more": result.more,
+        "reset": result.reset,
+        "patients": result.rows,
+        "deleted": result.deleted,
+    }), headers={"Cache-Control": "no-store"})
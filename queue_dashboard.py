@@ -1,11 +1,32 @@
 # gui/queue_dashboard.py
 
-from nicegui import ui
-from core.queue_manager import QueueManager
-from database import get_connection
-from core.status_logger import log_status_change
+from nicegui import background_tasks, ui
+from core.queue_manager import get_queue_manager
+from core.priority_index import ACTIVE_STATUSES
+from core import event_bus
+from core.event_bus import bus
+from core.priority_batch import columns_from_patients, priority_batch
+from core.symptoms import SYMPTOM_WEIGHTS
+from gui.components.pager import Pager
+from core import async_db
+from core.patient import Patient
+from database import search_patients, transition_status, delete_patient as db_delete_patient
 
-qm = QueueManager()
+
+# Default cards per page (viewers can change it); only one page is in the DOM
+PAGE_SIZE = 25
+
+STATUS_FILTERS = ["Waiting", "Waiting Treatment", "In Treatment", "Completed", "All"]
+
+# Sort options offered on the dashboard (keys are QueueManager SORTS)
+SORT_LABELS = {"priority": "Priority", "arrival": "Arrival (oldest first)"}
+
+# Bursts of patient events within this window trigger one re-render
+EVENT_COALESCE_SECONDS = 0.3
+
+# Slow safety-net refresh: wait-time points keep accruing with no event,
+# and writes from other processes never reach the in-process bus
+AGING_REFRESH_SECONDS = 60
 
 # -----------------------------------------------------------
 # STATUS CHIP
@@ -28,17 +49,29 @@ def status_chip(status: str):
 # -----------------------------------------------------------
 # PRIORITY CHIP
 # -----------------------------------------------------------
-def priority_chip(score: float):
+def priority_level(score: float):
     if score >= 300:
-        label, color = "Critical", "#DC2626"
-    elif score >= 150:
-        label, color = "Urgent", "#F59E0B"
-    else:
-        label, color = "Stable", "#16A34A"
+        return "Critical", "#DC2626"
+    if score >= 150:
+        return "Urgent", "#F59E0B"
+    return "Stable", "#16A34A"
+
+
+def priority_chip(score: float):
+    label, color = priority_level(score)
 
     with ui.row().classes("items-center gap-1"):
-        ui.icon("priority_high").style(f"color:{color}; font-size:18px")
-        ui.label(f"{label} ({int(score)})").style(f"color:{color}; font-weight:600;")
+        icon = ui.icon("priority_high").style(f"color:{color}; font-size:18px")
+        text = ui.label(f"{label} ({int(score)})").style(f"color:{color}; font-weight:600;")
+    return icon, text
+
+
+def update_priority_chip(chip, score: float):
+    icon, text = chip
+    label, color = priority_level(score)
+    icon.style(replace=f"color:{color}; font-size:18px")
+    text.style(replace=f"color:{color}; font-weight:600;")
+    text.set_text(f"{label} ({int(score)})")
 
 
 # -----------------------------------------------------------
@@ -52,30 +85,22 @@ def open_assign_room_dialog(patient, refresh_fn):
         ui.label(f"Assign Room • {patient.full_name}").classes("text-xl font-bold")
         room_field = ui.input("Room (ER-5, Trauma-4, Bed-12)").classes("w-full")
 
-        def save_room():
+        async def save_room():
             room = (room_field.value or "").strip()
             if not room:
                 ui.notify("Room cannot be empty!", color="red")
                 return
 
-            conn = get_connection()
-            old_status = conn.execute(
-                "SELECT status FROM patients WHERE id=?", (patient.id,)
-            ).fetchone()["status"]
-
-            conn.execute(
-                "UPDATE patients SET room=?, status='In Treatment' WHERE id=?",
-                (room, patient.id),
+            # Room + status + history log in one commit
+            await async_db.write(
+                transition_status,
+                patient.id, "In Treatment", f"Assigned room {room}",
+                event=event_bus.ROOM, room=room,
             )
-            conn.commit()
-            conn.close()
-
-            # LOG
-            log_status_change(patient.id, old_status, "In Treatment", f"Assigned room {room}")
 
             dialog.close()
             ui.notify(f"Assigned room {room}", color="green")
-            refresh_fn()
+            await refresh_fn()
 
         ui.button("Save", on_click=save_room, color="blue").classes("w-full text-white font-bold")
         ui.button("Cancel", on_click=dialog.close, color="gray").classes("w-full")
@@ -86,39 +111,31 @@ def open_assign_room_dialog(patient, refresh_fn):
 # -----------------------------------------------------------
 # DISCHARGE (with status logging)
 # -----------------------------------------------------------
-def discharge_patient(pid, refresh_fn):
-    conn = get_connection()
-
-    old_status = conn.execute("SELECT status FROM patients WHERE id=?", (pid,)).fetchone()["status"]
-
-    conn.execute("UPDATE patients SET status='Completed' WHERE id=?", (pid,))
-    conn.commit()
-    conn.close()
-
-    log_status_change(pid, old_status, "Completed", "Discharged from ER")
+async def discharge_patient(pid, refresh_fn):
+    await async_db.write(
+        transition_status, pid, "Completed", "Discharged from ER", event=event_bus.DISCHARGE
+    )
 
     ui.notify("Patient marked as Completed", color="green")
-    refresh_fn()
+    await refresh_fn()
 
 
 # -----------------------------------------------------------
 # DELETE
 # -----------------------------------------------------------
-def delete_patient(patient_id: int, refresh_fn):
-    conn = get_connection()
-    conn.execute("DELETE FROM patients WHERE id=?", (patient_id,))
-    conn.commit()
-    conn.close()
+async def delete_patient(patient_id: int, refresh_fn):
+    await async_db.write(db_delete_patient, patient_id)
     ui.notify("Patient deleted", color="red")
-    refresh_fn()
+    await refresh_fn()
 
 
 # -----------------------------------------------------------
 # PATIENT CARD (FINAL FIXED VERSION)
 # -----------------------------------------------------------
-def create_patient_card(p, refresh_fn):
+def create_patient_card(p, refresh_fn, score=None):
 
-    score = qm.calculate_priority(p)
+    if score is None:
+        score = get_queue_manager().calculate_priority(p)
     norm_status = (p.status or "").strip().lower().replace("_", " ")
 
     card = ui.card().classes(
@@ -140,7 +157,7 @@ def create_patient_card(p, refresh_fn):
                     ui.label(p.full_name).classes("text-xl font-bold")
                     status_chip(p.status)
 
-                priority_chip(score)
+                chip = priority_chip(score)
 
                 with ui.row().classes("text-sm text-gray-700 mt-2 gap-6"):
                     ui.label(f"Age: {p.age}")
@@ -194,50 +211,182 @@ def create_patient_card(p, refresh_fn):
                     ["prevent", "stop"]
                 )
 
+    return card, chip
+
+
+# -----------------------------------------------------------
+# KEYED CARD LIST
+# -----------------------------------------------------------
+class PatientCards:
+    """Dashboard cards keyed by patient id, patched in place on refresh.
+
+    Only the difference reaches the browser: unchanged cards send nothing,
+    a new score rewrites just the priority chip, an edited patient's card
+    is rebuilt, and rank changes are a move within the container.
+    """
+
+    def __init__(self, container, refresh_fn):
+        self.container = container
+        self.refresh_fn = refresh_fn
+        self.cards = {}   # id -> [card, patient, int score, chip]
+
+    def __len__(self):
+        return len(self.cards)
+
+    def sync(self, patients, scores):
+        """Make the container show exactly these patients in this order."""
+        wanted = {p.id for p in patients}
+        for pid in [pid for pid in self.cards if pid not in wanted]:
+            self.container.remove(self.cards.pop(pid)[0])
+
+        for index, (p, score) in enumerate(zip(patients, scores)):
+            self._place(index, p, score)
+
+    def _place(self, index, p, score):
+        entry = self.cards.get(p.id)
+
+        if entry is not None and entry[1] != p:
+            self.container.remove(entry[0])
+            entry = None
+
+        if entry is None:
+            with self.container:
+                card, chip = create_patient_card(p, self.refresh_fn, float(score))
+            entry = self.cards[p.id] = [card, p, int(score), chip]
+        elif entry[2] != int(score):
+            update_priority_chip(entry[3], float(score))
+            entry[2] = int(score)
+
+        children = self.container.default_slot.children
+        if index >= len(children) or children[index] is not entry[0]:
+            entry[0].move(target_index=index)
+
 
 # -----------------------------------------------------------
 # MAIN QUEUE DASHBOARD PAGE
 # -----------------------------------------------------------
-@ui.page("/queue")
-def queue_dashboard_page():
+# Routed by main.py (imported on first visit, wrapped in the layout)
+async def queue_dashboard_page():
+    qm = get_queue_manager()
 
     ui.label("🏥 Emergency Department — Queue Dashboard") \
         .classes("text-3xl font-bold mb-5")
 
-    FILTER = {"value": "Waiting"}
-
-    # ---- Status Filter Buttons ----
-    with ui.row().classes("gap-3 mb-4"):
-        for label in ["Waiting", "Waiting Treatment", "In Treatment", "Completed", "All"]:
-            ui.button(
-                label,
-                on_click=lambda l=label: (
-                    FILTER.update({"value": l}),
-                    ui.notify(f"Filter → {l}", color="blue"),
-                    refresh.refresh()
-                )
+    FILTER = {"value": "Waiting", "sort": "priority", "symptom": None, "search": ""}
+    RENDERED = {"version": None}
+
+    def status_filter():
+        return None if FILTER["value"] == "All" else FILTER["value"]
+
+    def from_snapshot():
+        return (status_filter() in ACTIVE_STATUSES and FILTER["sort"] == "priority"
+                and FILTER["symptom"] is None and not FILTER["search"])
+
+    async def set_filter(**changes):
+        FILTER.update(changes)
+        RENDERED["version"] = None
+        # Matches are ranked by relevance; the sort choice doesn't apply
+        sort_select.set_enabled(not FILTER["search"])
+        if "value" in changes:
+            ui.notify(f"Filter → {changes['value']}", color="blue")
+        await pager.reset()
+
+    # Ranked full-text matches replace the list while the box has text
+    # (status and symptom filters still apply)
+    ui.input(
+        "Search name, phone, symptoms or notes",
+        on_change=lambda e: set_filter(search=(e.value or "").strip()),
+    ).props("clearable debounce=250").classes("w-full mb-2")
+
+    # ---- Status Filter Buttons (with live counts) + Sort ----
+    filter_buttons = {}
+    with ui.row().classes("gap-3 mb-4 items-center"):
+        for label in STATUS_FILTERS:
+            filter_buttons[label] = ui.button(
+                label, on_click=lambda l=label: set_filter(value=l)
             ).props("outline").classes("text-sm")
 
+        sort_select = ui.select(
+            SORT_LABELS, value=FILTER["sort"], label="Sort by",
+            on_change=lambda e: set_filter(sort=e.value),
+        ).classes("w-48")
+
+        ui.select(
+            {"": "All symptoms", **{name: name for name in SYMPTOM_WEIGHTS}},
+            value="", label="Symptom",
+            on_change=lambda e: set_filter(symptom=e.value or None),
+        ).classes("w-56")
+
+    def show_counts(counts):
+        for label, button in filter_buttons.items():
+            n = sum(counts.values()) if label == "All" else counts.get(label, 0)
+            button.set_text(f"{label} ({n})")
+
     cards_container = ui.column().classes("w-full")
 
-    @ui.refreshable
-    def refresh():
-        cards_container.clear()
+    async def fetch(cursor, limit):
+        """One page for the current filter: ([(patient, score)], next cursor).
+
+        Active statuses in priority order are sliced out of the shared
+        snapshot (no SQLite, offset cursors); every other filter/sort pages
+        through the database by keyset, selecting only the card columns
+        (a symptom filter is a bit test on symptom_mask). A search pages
+        through ranked FTS5 matches within the status and symptom filters
+        (offset cursors).
+        """
+        status = status_filter()
+        snap = await async_db.read(qm.get_snapshot)
+        show_counts(snap.status_counts)
+
+        if FILTER["search"]:
+            offset = cursor or 0
+            rows = await async_db.read(
+                search_patients, FILTER["search"], limit, [status] if status else None,
+                FILTER["symptom"], offset,
+            )
+            patients = [Patient.from_db_row_trusted(r) for r in rows]
+            scores = priority_batch(columns_from_patients(patients)) if patients else []
+            return list(zip(patients, scores)), (offset + limit if len(rows) == limit else None)
+
+        if from_snapshot():
+            offset = cursor or 0
+            patients, scores = snap.page(status, offset, limit)
+            RENDERED["version"] = snap.version
+            end = offset + len(patients)
+            return list(zip(patients, scores)), (end if end < snap.count(status) else None)
+
+        patients, next_cursor = await async_db.read(
+            qm.get_page, cursor, limit, status, FILTER["sort"], symptom=FILTER["symptom"]
+        )
+        # Score the whole page in one vectorized pass instead of per card
+        scores = priority_batch(columns_from_patients(patients)) if patients else []
+        return list(zip(patients, scores)), next_cursor
 
-        all_patients = qm.fetch_all_patients()
-        f = FILTER["value"]
+    def render(items):
+        cards.sync([p for p, _ in items], [score for _, score in items])
 
-        if f != "All":
-            visible = [p for p in all_patients if p.status == f]
-        else:
-            visible = all_patients
+    cards = PatientCards(cards_container, lambda: refresh())
+    pager = Pager(fetch, render, PAGE_SIZE)
 
-        visible = sorted(visible, key=lambda p: qm.calculate_priority(p), reverse=True)
+    async def refresh():
+        # Every client shares one snapshot build; skip the re-render when
+        # nothing changed since this client last drew it.
+        if (from_snapshot()
+                and RENDERED["version"] is not None
+                and (await async_db.read(qm.get_snapshot)).version == RENDERED["version"]):
+            return
 
-        for p in visible:
-            create_patient_card(p, refresh.refresh)
+        # Re-fetch just the visible page; cards are diffed, not rebuilt
+        await pager.load()
 
-    refresh()
-    ui.timer(6, refresh.refresh)
+    await pager.load()
+
+    # Push-based: re-render only when patients change (coalesced bursts)
+    unsubscribe = bus.subscribe_coalesced(
+        lambda events: background_tasks.create(refresh(), name="queue refresh"),
+        window=EVENT_COALESCE_SECONDS,
+    )
+    ui.context.client.on_delete(unsubscribe)
+    ui.timer(AGING_REFRESH_SECONDS, refresh)
 
     return cards_container
@@ -0,0 +1,20 @@
+# tests/conftest.py
+
+import pytest
+import database
+from core.queue_manager import reset_priority_index
+from core.queue_snapshot import reset_queue_snapshot
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """Point the connection pool at a fresh, initialized database file."""
+    original = database.DB_PATH
+    database.set_database_path(str(tmp_path / "er_triage.db"))
+    database.init_database()
+    reset_priority_index()
+    reset_queue_snapshot()
+    yield database.DB_PATH
+    reset_priority_index()
+    reset_queue_snapshot()
+    database.set_database_path(original)
@@ -0,0 +1,24 @@
+# tests/helpers.py
+#
+# Shared builders for test modules (fixtures live in conftest.py).
+
+from database import insert_patient
+
+
+def intake(**overrides):
+    """Intake-form dict for a valid Waiting patient; overrides replace fields."""
+    data = {
+        "first_name": "Jane", "last_name": "Smith", "phone": "999", "age": 60,
+        "symptoms": "Head Injury", "duration": "2h", "pain_level": 5,
+        "is_pregnant": 0, "mobility_issues": 0, "stroke_alert": 0,
+        "symptom_score": 8, "age_weight": 0, "pain_weight": 7.5,
+        "overall_priority": 15.5, "status": "Waiting",
+        "arrival_time": "2025-01-01T12:00:00",
+    }
+    data.update(overrides)
+    return data
+
+
+def make_patient(**overrides):
+    """Insert intake(**overrides); returns the new id."""
+    return insert_patient(intake(**overrides))
@@ -0,0 +1,60 @@
+# tests/test_archive.py
+
+import asyncio
+from datetime import datetime, timedelta
+
+from core.archive import archive_batch, archive_completed, archive_in_background
+from core.change_journal import changes_since, current_version
+from core.queue_manager import QueueManager
+from core.timestamps import epoch_ms
+from database import get_connection, get_patient, transition_status
+from tests.helpers import make_patient
+
+
+def count(sql):
+    return get_connection().execute(sql).fetchone()[0]
+
+
+def backdate_history(pid, hours):
+    stamp = (datetime.now() - timedelta(hours=hours)).isoformat()
+    get_connection().execute("UPDATE status_history SET timestamp=? WHERE patient_id=?", (stamp, pid))
+
+
+def test_old_completed_visits_move_with_their_history(temp_db):
+    done = make_patient(first_name="Done")
+    transition_status(done, "Completed", "Discharged")
+    backdate_history(done, 48)
+    waiting = make_patient(first_name="Waiting")
+
+    assert archive_completed(max_age_hours=24) == 1
+
+    assert get_patient(done) is None and get_patient(waiting) is not None
+    assert count("SELECT COUNT(*) FROM patients") == 1
+    assert count("SELECT COUNT(*) FROM status_history") == 0
+    assert count("SELECT COUNT(*) FROM patients_archive") == 1
+    assert count("SELECT COUNT(*) FROM status_history_archive") == 1
+
+    # Reporting still sees every visit and every status change
+    assert count("SELECT COUNT(*) FROM all_patients") == 2
+    assert count(f"SELECT COUNT(*) FROM all_status_history WHERE patient_id={done}") == 1
+    assert QueueManager().status_counts() == {"Waiting": 1}
+
+
+def test_recent_and_active_visits_stay_hot(temp_db):
+    recent = make_patient()
+    transition_status(recent, "Completed", "Discharged")
+    make_patient(arrival_time="2020-01-01T00:00:00")  # old, but still waiting
+
+    assert archive_completed(max_age_hours=24) == 0
+    assert count("SELECT COUNT(*) FROM patients") == 2
+
+
+def test_batches_and_journal(temp_db):
+    ids = [make_patient(status="Completed", arrival_time="2020-01-01T00:00:00") for _ in range(5)]
+    version = current_version()
+
+    assert archive_batch(epoch_ms("2021-01-01T00:00:00"), batch_size=2) == ids[:2]
+    assert asyncio.run(archive_in_background(max_age_hours=1, batch_size=2)) == 3
+
+    assert changes_since(version).deleted == ids
+    assert [r["id"] for r in get_connection().execute("SELECT id FROM all_patients ORDER BY id")] == ids
@@ -0,0 +1,59 @@
+# tests/test_async_db.py
+
+import asyncio
+import threading
+import time
+
+from core import async_db
+from database import get_connection, get_patient, transaction
+from tests.helpers import make_patient
+
+WRITE_SECONDS = 0.5
+
+
+def test_clients_stay_responsive_during_long_write(temp_db):
+    pid = make_patient()
+
+    def long_write():
+        with transaction() as conn:
+            conn.execute("UPDATE patients SET triage_notes='slow' WHERE id=?;", (pid,))
+            time.sleep(WRITE_SECONDS)   # write lock held (slow disk, big batch)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        writing = asyncio.create_task(async_db.write(long_write))
+        await asyncio.sleep(0.05)
+
+        # Another client's read is served while the write holds the lock
+        start = loop.time()
+        row = await async_db.read(get_patient, pid)
+        read_latency = loop.time() - start
+
+        # ...and the event loop keeps ticking for every other websocket
+        worst_tick = 0.0
+        while not writing.done():
+            tick = loop.time()
+            await asyncio.sleep(0.01)
+            worst_tick = max(worst_tick, loop.time() - tick)
+
+        await writing
+        return row, read_latency, worst_tick
+
+    row, read_latency, worst_tick = asyncio.run(scenario())
+
+    assert row["triage_notes"] == ""          # WAL: readers see the last commit
+    assert read_latency < WRITE_SECONDS / 5
+    assert worst_tick < WRITE_SECONDS / 5
+    notes = get_connection().execute(
+        "SELECT triage_notes FROM patients WHERE id=?;", (pid,)
+    ).fetchone()[0]
+    assert notes == "slow"
+
+
+def test_writes_are_serialized_on_one_thread(temp_db):
+    async def scenario():
+        return await asyncio.gather(*(
+            async_db.write(lambda: threading.current_thread().name) for _ in range(5)
+        ))
+
+    assert len(set(asyncio.run(scenario()))) == 1
@@ -0,0 +1,41 @@
+# tests/test_bulk_insert.py
+
+from datetime import datetime
+from core.patient import Patient
+from database import get_connection, insert_patient, insert_patients_many
+from tests.helpers import intake
+
+
+def drill(i):
+    return intake(first_name=f"Drill{i}", phone=str(i))
+
+
+def test_bulk_insert_returns_ids_in_order(temp_db):
+    insert_patient(drill(0))  # ids must continue after existing rows
+
+    ids = insert_patients_many((drill(i) for i in range(1, 8)), chunk_size=3)
+
+    rows = get_connection().execute(
+        "SELECT id, first_name FROM patients WHERE id >= ? ORDER BY id;", (ids[0],)
+    ).fetchall()
+    assert ids == [r["id"] for r in rows]
+    assert [r["first_name"] for r in rows] == [f"Drill{i}" for i in range(1, 8)]
+
+
+def test_bulk_insert_accepts_patient_objects(temp_db):
+    p = Patient(
+        id=None, first_name="Obj", last_name="Patient", phone="1",
+        age=70, symptoms=["Dizziness"], pain_level=2,
+        arrival_time=datetime(2025, 1, 1, 9, 30),
+    )
+
+    [pid] = insert_patients_many([p])
+
+    row = get_connection().execute("SELECT * FROM patients WHERE id=?;", (pid,)).fetchone()
+    assert row["first_name"] == "Obj"
+    assert row["symptoms"] == "Dizziness"
+    assert row["arrival_time"] == "2025-01-01T09:30:00"
+
+
+def test_bulk_insert_empty(temp_db):
+    assert insert_patients_many([]) == []
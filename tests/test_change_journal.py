@@ -0,0 +1,56 @@
+# tests/test_change_journal.py
+
+from core.change_journal import changes_since, current_version, prune_changes
+from database import delete_patient, get_connection, transition_status
+from tests.helpers import make_patient
+
+
+def test_changes_since_returns_each_touched_patient_once(temp_db):
+    assert current_version() == 0
+    a = make_patient(first_name="A")
+    b = make_patient(first_name="B")
+    start = current_version()
+
+    transition_status(a, "In Treatment", "Assigned room ER-1", room="ER-1")
+    transition_status(a, "Completed", "Discharged")
+    delete_patient(b)
+    make_patient(first_name="C")
+
+    changes = changes_since(start)
+    assert [r["first_name"] for r in changes.rows] == ["A", "C"]
+    assert changes.rows[0]["status"] == "Completed"
+    assert changes.deleted == [b]
+    assert changes.version == current_version()
+    assert not changes.more and not changes.reset
+
+    assert changes_since(changes.version).rows == []
+
+
+def test_limit_pages_through_the_journal(temp_db):
+    ids = [make_patient() for _ in range(5)]
+
+    seen, version = [], 0
+    while True:
+        changes = changes_since(version, limit=2)
+        seen += [r["id"] for r in changes.rows]
+        version = changes.version
+        if not changes.more:
+            break
+    assert seen == ids
+
+
+def test_retention_prunes_a_prefix_and_flags_stale_readers(temp_db):
+    pid = make_patient()
+    for _ in range(4):
+        transition_status(pid, "Waiting", "")
+    latest = current_version()
+
+    assert prune_changes(max_rows=3) == latest - 3
+    assert changes_since(latest - 3).reset is False
+    stale = changes_since(0)
+    assert stale.reset and stale.version == latest
+
+    assert prune_changes(max_age_hours=-1) == 3
+    assert changes_since(latest).reset is False
+    assert changes_since(latest - 1).reset is True
+    assert get_connection().execute("SELECT COUNT(*) FROM patient_changes").fetchone()[0] == 0
@@ -0,0 +1,38 @@
+# tests/test_connection_pool.py
+
+import threading
+from database import get_connection, transaction
+
+
+def test_same_thread_reuses_connection(temp_db):
+    assert get_connection() is get_connection()
+
+
+def test_each_thread_gets_its_own_connection(temp_db):
+    main_conn = get_connection()
+    seen = []
+
+    t = threading.Thread(target=lambda: seen.append(get_connection()))
+    t.start()
+    t.join()
+
+    assert seen[0] is not main_conn
+
+
+def test_pragmas_applied(temp_db):
+    conn = get_connection()
+    assert conn.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA busy_timeout;").fetchone()[0] == 5000
+    assert conn.execute("PRAGMA synchronous;").fetchone()[0] == 1  # NORMAL
+
+
+def test_transaction_rolls_back_on_error(temp_db):
+    try:
+        with transaction() as conn:
+            conn.execute("INSERT INTO patients (first_name) VALUES ('Ghost');")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    count = get_connection().execute("SELECT COUNT(*) FROM patients;").fetchone()[0]
+    assert count == 0
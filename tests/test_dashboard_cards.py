@@ -0,0 +1,58 @@
+# tests/test_dashboard_cards.py
+
+from dataclasses import replace
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("nicegui")
+
+from nicegui import Client, ui
+from nicegui.page import page
+
+from core.patient import Patient
+from queue_dashboard import PatientCards
+
+
+def patient(pid, **fields):
+    return Patient(pid, f"P{pid}", "Test", "", 40, status="Waiting",
+                   arrival_time=datetime(2025, 1, 1), **fields)
+
+
+@pytest.fixture
+def cards():
+    client = Client(page("/"), request=None)
+    with client:
+        container = ui.column()
+        yield PatientCards(container, lambda: None)
+
+
+def shown(cards):
+    by_card = {id(entry[0]): pid for pid, entry in cards.cards.items()}
+    return [by_card[id(c)] for c in cards.container.default_slot.children]
+
+
+def test_sync_keeps_unchanged_cards(cards):
+    a, b, c = patient(1), patient(2), patient(3)
+    cards.sync([a, b, c], [30, 20, 10])
+    originals = {pid: entry[0] for pid, entry in cards.cards.items()}
+
+    # c jumps to the top and b leaves; a is untouched
+    cards.sync([c, a], [40, 30])
+
+    assert shown(cards) == [3, 1]
+    assert cards.cards[1][0] is originals[1]
+    assert cards.cards[3][0] is originals[3]
+
+
+def test_sync_rebuilds_only_edited_patient(cards):
+    a, b = patient(1), patient(2)
+    cards.sync([a, b], [30, 20])
+    card_a, card_b = cards.cards[1][0], cards.cards[2][0]
+
+    cards.sync([a, replace(b, room="ER-2")], [31, 20])
+
+    assert cards.cards[1][0] is card_a
+    assert cards.cards[1][2] == 31
+    assert cards.cards[2][0] is not card_b
+    assert shown(cards) == [1, 2]
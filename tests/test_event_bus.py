@@ -0,0 +1,66 @@
+# tests/test_event_bus.py
+
+import asyncio
+import threading
+from core import event_bus
+from core.event_bus import EventBus, bus
+from database import transition_status, delete_patient
+from tests.helpers import make_patient
+
+
+def test_topic_filter_and_unsubscribe():
+    b = EventBus()
+    seen = []
+    unsubscribe = b.subscribe(seen.append, topics=[event_bus.DISCHARGE])
+
+    b.publish(event_bus.INTAKE, 1)
+    b.publish(event_bus.DISCHARGE, 2)
+    unsubscribe()
+    b.publish(event_bus.DISCHARGE, 3)
+
+    assert [e.patient_id for e in seen] == [2]
+
+
+def test_failing_subscriber_does_not_break_publish():
+    b = EventBus()
+    seen = []
+    b.subscribe(lambda e: 1 / 0)
+    b.subscribe(seen.append)
+
+    b.publish(event_bus.DELETE, 9)
+    assert len(seen) == 1
+
+
+def test_coalesced_burst_fires_once():
+    async def scenario():
+        b = EventBus()
+        batches = []
+        b.subscribe_coalesced(batches.append, window=0.05)
+
+        for pid in range(5):
+            b.publish(event_bus.INTAKE, pid)
+        # ... including publishes from a worker thread
+        t = threading.Thread(target=b.publish, args=(event_bus.TRIAGE, 99))
+        t.start()
+        t.join()
+
+        await asyncio.sleep(0.15)
+        return batches
+
+    batches = asyncio.run(scenario())
+    assert len(batches) == 1
+    assert [e.patient_id for e in batches[0]] == [0, 1, 2, 3, 4, 99]
+
+
+def test_database_writes_publish_topics(temp_db):
+    seen = []
+    unsubscribe = bus.subscribe(lambda e: seen.append(e.topic))
+    try:
+        pid = make_patient()
+        transition_status(pid, "In Treatment", event=event_bus.ROOM, room="ER-1")
+        transition_status(pid, "Completed", event=event_bus.DISCHARGE)
+        delete_patient(pid)
+    finally:
+        unsubscribe()
+
+    assert seen == [event_bus.INTAKE, event_bus.ROOM, event_bus.DISCHARGE, event_bus.DELETE]
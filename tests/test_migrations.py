@@ -0,0 +1,44 @@
+# tests/test_migrations.py
+
+import sqlite3
+import database
+from database import init_database, get_connection, get_schema_version, SCHEMA_VERSION
+
+
+def test_fresh_database_is_current(temp_db):
+    assert get_schema_version() == SCHEMA_VERSION
+
+
+def test_current_schema_skips_migrations(temp_db, monkeypatch):
+    def explode(conn):
+        raise AssertionError("migration re-ran on a current schema")
+
+    monkeypatch.setattr(database, "MIGRATIONS", [(1, "boom", explode)])
+    init_database()
+
+
+def test_legacy_file_is_upgraded(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    legacy = sqlite3.connect(path)
+    legacy.execute("CREATE TABLE patients (id INTEGER PRIMARY KEY, first_name TEXT, status TEXT);")
+    legacy.commit()
+    legacy.close()
+
+    original = database.DB_PATH
+    database.set_database_path(path)
+    try:
+        init_database()
+        conn = get_connection()
+        cols = {r["name"] for r in conn.execute("PRAGMA table_info(patients);")}
+        assert {"arrival_time", "room", "overall_priority"} <= cols
+        assert get_schema_version() == SCHEMA_VERSION
+    finally:
+        database.set_database_path(original)
+
+
+def test_waiting_queue_query_uses_index(temp_db):
+    plan = get_connection().execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM patients "
+        "WHERE status='Waiting' ORDER BY arrival_time;"
+    ).fetchall()
+    assert any("idx_patients_status_arrival" in row["detail"] for row in plan)
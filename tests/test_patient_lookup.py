@@ -0,0 +1,47 @@
+# tests/test_patient_lookup.py
+
+from core.queue_manager import QueueManager
+from database import (
+    delete_patient, get_connection, get_patient, reset_triage, transition_status,
+)
+from tests.helpers import make_patient
+
+
+def traced(fn):
+    statements = []
+    get_connection().set_trace_callback(statements.append)
+    try:
+        result = fn()
+    finally:
+        get_connection().set_trace_callback(None)
+    return result, statements
+
+
+def test_lookup_is_cached_until_a_write(temp_db):
+    pid = make_patient()
+    assert get_patient(pid)["status"] == "Waiting"
+
+    row, statements = traced(lambda: get_patient(pid))
+    assert row["first_name"] == "Jane" and statements == []
+
+    transition_status(pid, "In Treatment", "Assigned room ER-3", room="ER-3")
+    row, statements = traced(lambda: get_patient(pid))
+    assert row["room"] == "ER-3" and len(statements) == 1
+
+    reset_triage(pid)
+    assert get_patient(pid)["temperature"] is None
+
+
+def test_lookup_sees_deletes_and_missing_ids(temp_db):
+    pid = make_patient()
+    assert QueueManager().get_patient_by_id(pid).full_name == "Jane Smith"
+
+    delete_patient(pid)
+    assert get_patient(pid) is None
+    assert QueueManager().get_patient_by_id(pid) is None
+
+
+def test_returned_dicts_do_not_leak_into_cache(temp_db):
+    pid = make_patient()
+    get_patient(pid)["status"] = "Completed"
+    assert get_patient(pid)["status"] == "Waiting"
@@ -1,6 +1,8 @@
 # tests/test_patient_model.py
 
 from core.patient import Patient
+from core.symptoms import symptom_mask
+from core.timestamps import epoch_ms
 from datetime import datetime, timedelta
 
 def test_validation_rules():
@@ -42,3 +44,24 @@ def test_wait_time_calculation():
         arrival_time=earlier
     )
     assert 9 <= p.queue_time_minutes <= 11
+
+
+def test_patient_is_slotted():
+    p = Patient(id=1, first_name="A", last_name="B", phone="C", age=20)
+    assert not hasattr(p, "__dict__")
+
+
+def test_trusted_decode_matches_validated_decode():
+    row = {
+        "id": 7, "first_name": "A", "last_name": "B", "phone": "C", "age": 70,
+        "symptoms": "Chest Pain,Dizziness", "duration": "1h", "pain_level": 6,
+        "is_pregnant": 0, "mobility_issues": 1, "stroke_alert": 1,
+        "temperature": 39.5, "bp_systolic": 85, "bp_diastolic": 60,
+        "heart_rate": 130, "respiratory_rate": 26, "triage_notes": "",
+        "symptom_score": 13, "age_weight": 2.5, "pain_weight": 9.0,
+        "overall_priority": 74.5, "status": "Waiting Treatment",
+        "arrival_time": "2025-01-01T12:00:00", "room": None,
+        "symptom_mask": symptom_mask("Chest Pain,Dizziness"),
+        "arrival_ms": epoch_ms("2025-01-01T12:00:00"),
+    }
+    assert Patient.from_db_row_trusted(row) == Patient.from_db_row(row)
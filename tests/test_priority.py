@@ -0,0 +1,61 @@
+# tests/test_priority.py
+
+from datetime import datetime, timedelta
+from core.patient import Patient
+from core.priority import priority_at, queue_key, static_score
+from core.queue_manager import QueueManager
+from database import get_connection, insert_patient, transition_status
+from tests.helpers import intake
+
+
+def make(age=30, pain=0, minutes_ago=0, **kw):
+    return Patient(
+        id=None, first_name="A", last_name="B", phone="C",
+        age=age, pain_level=pain,
+        arrival_time=datetime(2025, 1, 1, 12, 0) - timedelta(minutes=minutes_ago),
+        **kw,
+    )
+
+
+def test_wait_time_ages_the_score():
+    p = make(pain=2)
+    now = datetime(2025, 1, 1, 13, 0)           # waited 60 minutes
+    assert priority_at(p, now) == static_score(p) + 15
+
+
+def test_queue_key_orders_like_live_score():
+    patients = [
+        make(pain=8),
+        make(pain=2, minutes_ago=90),
+        make(age=90, minutes_ago=30),
+        make(symptoms=["Chest Pain"], minutes_ago=45, is_code_stroke=True),
+    ]
+    now = datetime(2025, 1, 1, 14, 0)
+
+    by_live = sorted(patients, key=lambda p: priority_at(p, now), reverse=True)
+    by_key = sorted(patients, key=queue_key, reverse=True)
+    assert by_live == by_key
+
+
+def waiting(name, pain, minutes_ago):
+    arrival = datetime.now() - timedelta(minutes=minutes_ago)
+    return intake(first_name=name, symptoms="", symptom_score=0,
+                  pain_level=pain, pain_weight=pain * 1.5, arrival_time=arrival.isoformat())
+
+
+def test_ordered_queue_comes_from_persisted_key(temp_db):
+    fresh = insert_patient(waiting("Fresh", 4, 0))      # 6 points, no wait
+    waited = insert_patient(waiting("Waited", 0, 60))   # 0 points + 15 for the hour
+
+    assert [p.id for p in QueueManager().get_ordered_queue()] == [waited, fresh]
+    assert [p.id for p in QueueManager().get_ordered_queue(limit=1)] == [waited]
+
+
+def test_transition_refreshes_queue_key(temp_db):
+    pid = insert_patient(waiting("Vitals", 0, 0))
+    before = get_connection().execute("SELECT queue_key FROM patients WHERE id=?;", (pid,)).fetchone()[0]
+
+    transition_status(pid, "Waiting", bp_systolic=80)  # hypotensive: +10
+
+    after = get_connection().execute("SELECT queue_key FROM patients WHERE id=?;", (pid,)).fetchone()[0]
+    assert after - before == 10
@@ -0,0 +1,35 @@
+# tests/test_priority_batch.py
+
+from datetime import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from benchmarks.bench_batch_scoring import random_patients
+from core.patient import Patient
+from core.priority import priority_at
+from core.priority_batch import columns_from_patients, columns_from_rows, priority_batch
+from database import insert_patients_many, get_connection
+
+
+def test_batch_matches_scalar_exactly():
+    patients = random_patients(5000)
+    now = datetime(2025, 1, 2, 9, 15, 30)
+
+    batch = priority_batch(columns_from_patients(patients), now)
+    scalar = np.array([priority_at(p, now) for p in patients])
+
+    assert np.array_equal(batch, scalar)
+
+
+def test_batch_from_rows_matches_scalar(temp_db):
+    patients = random_patients(500, seed=11)
+    insert_patients_many(patients)
+    rows = get_connection().execute("SELECT * FROM patients ORDER BY id;").fetchall()
+    now = datetime(2025, 1, 3)
+
+    batch = priority_batch(columns_from_rows(rows), now)
+    scalar = np.array([priority_at(Patient.from_db_row(r), now) for r in rows])
+
+    assert np.array_equal(batch, scalar)
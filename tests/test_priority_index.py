@@ -0,0 +1,57 @@
+# tests/test_priority_index.py
+
+from datetime import datetime
+from core.patient import Patient
+from core.priority_index import PriorityIndex
+from core.queue_manager import QueueManager
+from database import insert_patient, transition_status, delete_patient
+from tests.helpers import intake
+
+
+def patient(pid, score, status="Waiting"):
+    p = Patient(
+        id=pid, first_name="P", last_name=str(pid), phone="",
+        age=30, status=status, arrival_time=datetime(2025, 1, 1),
+    )
+    p.overall_priority = score
+    return p
+
+
+def test_top_is_ordered_and_sliced():
+    index = PriorityIndex(key=lambda p: p.overall_priority)
+    index.load([patient(1, 10), patient(2, 50), patient(3, 30), patient(4, 99, "In Treatment")])
+
+    assert [p.id for p in index.top("Waiting")] == [2, 3, 1]
+    assert [p.id for p in index.top("Waiting", k=2)] == [2, 3]
+    assert [p.id for p in index.top("In Treatment")] == [4]
+
+
+def test_upsert_moves_and_remove_drops():
+    index = PriorityIndex(key=lambda p: p.overall_priority)
+    index.load([patient(1, 10), patient(2, 50)])
+
+    index.upsert(patient(1, 80))                        # re-scored
+    assert [p.id for p in index.top("Waiting")] == [1, 2]
+
+    index.upsert(patient(2, 50, "Completed"))           # leaves the active set
+    assert 2 not in index
+    assert [p.id for p in index.top("Waiting")] == [1]
+
+    index.remove(1)
+    assert len(index) == 0
+
+
+def test_index_follows_database_writes(temp_db):
+    qm = QueueManager()
+    low = insert_patient(intake(first_name="Low", symptoms="Fracture", pain_level=1))
+    assert [p.id for p in qm.get_ordered_queue()] == [low]   # loads index
+
+    high = insert_patient(intake(first_name="High", symptoms="Fracture", pain_level=9))
+    assert [p.id for p in qm.get_ordered_queue()] == [high, low]
+
+    transition_status(high, "Waiting Treatment", temperature=40.0)
+    assert [p.id for p in qm.get_ordered_queue()] == [low]
+    assert [p.id for p in qm.priority_index.top("Waiting Treatment")] == [high]
+
+    delete_patient(low)
+    assert qm.get_ordered_queue() == []
@@ -0,0 +1,81 @@
+# tests/test_queue_api.py
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from database import transition_status
+from queue_api import router
+from tests.helpers import make_patient
+
+
+@pytest.fixture
+def client(temp_db):
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as c:
+        yield c
+
+
+def test_queue_orders_patients_and_sets_etag(client):
+    low = make_patient(first_name="Low", symptom_score=1, pain_weight=0)
+    high = make_patient(first_name="High", symptom_score=30, stroke_alert=1)
+
+    r = client.get("/api/queue")
+    assert r.status_code == 200
+    assert r.headers["etag"].startswith('W/"')
+    assert r.headers["cache-control"] == "no-cache"
+    assert [p["id"] for p in r.json()["patients"]] == [high, low]
+    first, second = r.json()["patients"]
+    assert first["first_name"] == "High" and first["priority"] > second["priority"]
+
+
+def test_conditional_get_until_a_write(client):
+    pid = make_patient()
+    etag = client.get("/api/queue").headers["etag"]
+
+    r = client.get("/api/queue", headers={"If-None-Match": etag})
+    assert r.status_code == 304 and r.content == b""
+
+    transition_status(pid, "In Treatment", "Assigned room ER-1", room="ER-1")
+    r = client.get("/api/queue", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag and r.json()["patients"] == []
+
+
+def test_etag_is_per_query(client):
+    make_patient()
+    etag = client.get("/api/queue").headers["etag"]
+    r = client.get("/api/queue?limit=1", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+
+
+def test_counts_and_single_patient(client):
+    pid = make_patient()
+    make_patient(status="In Treatment")
+
+    r = client.get("/api/queue/counts")
+    assert r.json()["counts"]["Waiting"] == 1
+    assert r.json()["counts"]["In Treatment"] == 1
+
+    r = client.get(f"/api/patients/{pid}")
+    assert r.status_code == 200 and r.json()["first_name"] == "Jane"
+    assert client.get(f"/api/patients/{pid}", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+    assert client.get("/api/patients/999999").status_code == 404
+
+
+def test_rejects_unknown_status_and_large_limits(client):
+    assert client.get("/api/queue?status=Bogus").status_code == 422
+    assert client.get("/api/queue?limit=501").status_code == 422
+
+
+def test_changes_endpoint_serves_deltas(client):
+    pid = make_patient()
+    first = client.get("/api/changes").json()
+    assert [p["id"] for p in first["patients"]] == [pid]
+
+    transition_status(pid, "In Treatment", "Assigned room ER-2", room="ER-2")
+    delta = client.get(f"/api/changes?since={first['version']}").json()
+    assert delta["patients"][0]["room"] == "ER-2" and delta["deleted"] == []
+    assert client.get(f"/api/changes?since={delta['version']}").json()["patients"] == []
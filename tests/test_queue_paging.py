@@ -0,0 +1,116 @@
+# tests/test_queue_paging.py
+
+import pytest
+from datetime import datetime, timedelta
+from core.queue_manager import QueueManager
+from database import get_connection, get_patients_page, insert_patients_many
+from tests.helpers import intake
+
+
+def tied(i, status):
+    # Few distinct pains and arrivals: plenty of ties for the cursor
+    return intake(first_name=f"P{i}", phone=str(i), status=status,
+                  symptoms="", pain_level=i % 4,
+                  arrival_time=(datetime(2025, 1, 1) + timedelta(minutes=i % 3)).isoformat())
+
+
+def walk(qm, status, limit):
+    seen, cursor = [], None
+    while True:
+        page, cursor = qm.get_page(cursor, limit, status)
+        seen += [p.id for p in page]
+        if cursor is None:
+            return seen
+
+
+def test_pages_cover_queue_in_order(temp_db):
+    qm = QueueManager()
+    ids = insert_patients_many(tied(i, "Waiting") for i in range(23))
+
+    full = [p.id for p in qm.get_ordered_queue()]
+    assert sorted(full) == sorted(ids)
+    assert walk(qm, "Waiting", 5) == full
+    assert [p.id for p in qm.get_top(3)] == full[:3]
+
+
+def test_sql_pages_match_index_pages(temp_db):
+    qm = QueueManager()
+    insert_patients_many(tied(i, "Completed") for i in range(17))
+
+    # Completed is not held in memory, so this exercises the SQL keyset path
+    completed = walk(qm, "Completed", 4)
+    rows = get_connection().execute(
+        "SELECT id FROM patients WHERE status='Completed' ORDER BY queue_key DESC, id;"
+    ).fetchall()
+    assert completed == [r["id"] for r in rows]
+
+
+def test_unscored_rows_page_last(temp_db):
+    qm = QueueManager()
+    ids = insert_patients_many(tied(i, "Completed") for i in range(6))
+    get_connection().execute("UPDATE patients SET queue_key=NULL WHERE id IN (?, ?);", (ids[1], ids[4]))
+    get_connection().commit()
+
+    seen = walk(qm, None, 2)
+    assert len(seen) == len(set(seen)) == 6
+    assert seen[-2:] == [ids[1], ids[4]]
+
+
+def test_nurse_pages_newest_first_and_filter_status(temp_db):
+    ids = insert_patients_many(
+        tied(i, "Completed" if i % 3 == 0 else "Waiting") for i in range(20)
+    )
+    active = [pid for i, pid in enumerate(ids) if i % 3][::-1]
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = get_patients_page(cursor, 4, ("Waiting",))
+        seen += [p["id"] for p in page]
+        if cursor is None:
+            break
+
+    assert seen == active
+    assert [p["id"] for p in get_patients_page(None, 3)[0]] == ids[::-1][:3]
+
+
+def test_arrival_sort_pages_through_sql(temp_db):
+    qm = QueueManager()
+    insert_patients_many(tied(i, "Waiting") for i in range(11))
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = qm.get_page(cursor, 4, "Waiting", sort="arrival")
+        seen += [p.id for p in page]
+        if cursor is None:
+            break
+
+    rows = get_connection().execute(
+        "SELECT id FROM patients ORDER BY arrival_time, id;"
+    ).fetchall()
+    assert seen == [r["id"] for r in rows]
+
+
+def test_query_projects_card_columns(temp_db):
+    qm = QueueManager()
+    insert_patients_many(tied(i, "Completed") for i in range(3))
+
+    statements = []
+    get_connection().set_trace_callback(statements.append)
+    try:
+        page, _ = qm.get_page(None, 10, "Completed")
+    finally:
+        get_connection().set_trace_callback(None)
+
+    assert "SELECT *" not in statements[0]
+    assert "phone" not in statements[0]
+    assert [p.first_name for p in page] and all(p.phone == "" for p in page)
+
+    with pytest.raises(ValueError):
+        qm.query(sort="nonsense")
+
+
+def test_status_counts_group_by(temp_db):
+    insert_patients_many(
+        tied(i, "Completed" if i % 3 == 0 else "Waiting") for i in range(10)
+    )
+    assert QueueManager().status_counts() == {"Completed": 4, "Waiting": 6}
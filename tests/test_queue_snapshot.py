@@ -0,0 +1,54 @@
+# tests/test_queue_snapshot.py
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from core.queue_manager import QueueManager
+from core.queue_snapshot import get_queue_snapshot
+from database import get_connection, transition_status
+from tests.helpers import make_patient
+
+
+def test_snapshot_orders_like_sql(temp_db):
+    for pain in (2, 9, 5):
+        make_patient(pain_level=pain)
+    qm = QueueManager()
+
+    snap = qm.get_snapshot()
+    patients, scores = snap.page("Waiting")
+
+    assert [p.id for p in patients] == [p.id for p in qm.get_ordered_queue()]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_snapshot_shared_until_a_change(temp_db):
+    pid = make_patient()
+    qm = QueueManager()
+    first = qm.get_snapshot()
+
+    # Readers between changes get the same build and never query SQLite
+    statements = []
+    get_connection().set_trace_callback(statements.append)
+    try:
+        assert qm.get_snapshot() is first
+    finally:
+        get_connection().set_trace_callback(None)
+    assert statements == []
+
+    transition_status(pid, "In Treatment", "Assigned room ER-1", room="ER-1")
+    second = qm.get_snapshot()
+
+    assert second.version == first.version + 1
+    assert second.count("Waiting") == 0
+    assert [p.room for p in second.page("In Treatment")[0]] == ["ER-1"]
+    assert qm.get_snapshot() is second
+
+
+def test_snapshot_rebuilds_after_max_age(temp_db):
+    make_patient()
+    snapshot = get_queue_snapshot()
+    first = snapshot.get()
+
+    snapshot.max_age = 0
+    assert snapshot.get().version > first.version
@@ -0,0 +1,57 @@
+# tests/test_returning.py
+
+from core.archive import archive_completed
+from core.identity import name_key, normalize_phone
+from database import find_returning_patients, get_connection
+from tests.helpers import make_patient
+
+
+def test_keys_ignore_formatting():
+    assert normalize_phone("+1 (555) 123-4567") == normalize_phone("555.123.4567") == "5551234567"
+    assert normalize_phone("999") is None and normalize_phone(None) is None
+    assert name_key("  José ", "O'Neil") == name_key("jose", "ONEIL") == "oneil|jose"
+    assert name_key("Ann", "") is None
+
+
+def test_matches_by_phone_or_name_across_archive(temp_db):
+    old = make_patient(first_name="Ann", last_name="Lee", phone="555-123-4567",
+                       status="Completed", arrival_time="2020-01-01T12:00:00")
+    assert archive_completed(max_age_hours=1) == 1
+    make_patient(first_name="Bob", last_name="Stone", phone="(555) 000-1111")
+
+    by_phone = find_returning_patients("5551234567", "Annie", "Lee")
+    assert [(c["person_id"], c["phone_match"], c["name_match"]) for c in by_phone] == [(old, True, False)]
+
+    by_name = find_returning_patients("", "bob", "STONE")
+    assert [c["first_name"] for c in by_name] == ["Bob"]
+    assert find_returning_patients("12", "Bob", "") == []
+
+
+def test_linked_visits_group_under_one_person(temp_db):
+    first = make_patient(first_name="Ann", last_name="Lee", phone="555-123-4567",
+                         arrival_time="2024-01-01T12:00:00")
+    second = make_patient(first_name="Ann", last_name="Lee", phone="555 123 4567",
+                          arrival_time="2025-01-01T12:00:00", person_id=first, age=61)
+    make_patient(first_name="Ann", last_name="Lee", phone="555-999-0000")
+
+    candidates = find_returning_patients("5551234567", "Ann", "Lee")
+    assert candidates[0]["person_id"] == first
+    assert candidates[0]["visits"] == 2 and candidates[0]["age"] == 61
+    assert candidates[0]["phone_match"] and candidates[0]["name_match"]
+    assert [c["name_match"] and not c["phone_match"] for c in candidates[1:]] == [True]
+    assert get_connection().execute(
+        "SELECT person_id FROM patients WHERE id=?;", (second,)
+    ).fetchone()[0] == first
+
+
+def test_lookups_use_the_key_indexes(temp_db):
+    conn = get_connection()
+    for table in ("patients", "patients_archive"):
+        for column in ("phone_norm", "name_key"):
+            plan = conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM {table} WHERE {column} = ? "
+                f"ORDER BY arrival_ms DESC LIMIT 20;", ("x",)
+            ).fetchall()
+            assert [r["detail"] for r in plan] == [
+                f"SEARCH {table} USING INDEX idx_{table}_{column} ({column}=?)"
+            ]
@@ -0,0 +1,81 @@
+# tests/test_search.py
+
+import pytest
+
+from core.archive import archive_completed
+from database import delete_patient, get_connection, search_patients, transition_status
+from tests.helpers import make_patient
+
+
+def names(text, **kwargs):
+    return [r["first_name"] for r in search_patients(text, **kwargs)]
+
+
+def test_prefix_matches_across_indexed_columns(temp_db):
+    make_patient(first_name="Janet", last_name="Okafor", phone="555-123-4567", symptoms="Chest Pain")
+    make_patient(first_name="Bob", last_name="Marsh", symptoms="Fracture", triage_notes="dizzy after fall")
+
+    assert names("okaf") == ["Janet"]
+    assert names("555 12") == ["Janet"]
+    assert names("chest") == ["Janet"]
+    assert names("dizz") == ["Bob"]
+    assert names("bob frac") == ["Bob"]
+    assert names("") == [] and names("  ") == []
+
+
+def test_short_prefixes_search_names_and_phone_only(temp_db):
+    make_patient(first_name="Dina")
+    make_patient(first_name="Bob", triage_notes="dizzy after fall")
+    assert names("di") == ["Dina"]
+    assert names("diz") == ["Bob"]
+
+
+def test_names_outrank_notes(temp_db):
+    make_patient(first_name="Noah", triage_notes="brother of Jansen")
+    make_patient(first_name="Erik", last_name="Jansen")
+    assert names("jansen") == ["Erik", "Noah"]
+
+
+def test_user_input_is_not_parsed_as_fts_syntax(temp_db):
+    make_patient(first_name="Ann")
+    assert names('ann"') == ["Ann"]
+    assert names("ann AND OR NOT *") == []
+    assert names("ann -x") == []
+
+
+def test_index_follows_writes(temp_db):
+    pid = make_patient(first_name="Cara")
+    transition_status(pid, "Waiting Treatment", "", triage_notes="wheezing")
+    assert names("whee") == ["Cara"]
+    assert names("cara", statuses=["Waiting"]) == []
+
+    get_connection().execute("UPDATE patients SET first_name='Kara' WHERE id=?;", (pid,))
+    assert names("cara") == [] and names("kara") == ["Kara"]
+
+    delete_patient(pid)
+    assert names("kara") == []
+    assert get_connection().execute(
+        "INSERT INTO patients_fts (patients_fts) VALUES ('integrity-check');"
+    ).rowcount == 1
+
+
+def test_archived_visits_leave_the_index(temp_db):
+    make_patient(first_name="Old", status="Completed", arrival_time="2020-01-01T00:00:00")
+    archive_completed(max_age_hours=1)
+    assert names("old") == []
+
+
+def test_symptom_filter_and_offset_paging(temp_db):
+    make_patient(first_name="Ann", last_name="Pike", symptoms="Fracture")
+    make_patient(first_name="Ben", last_name="Pike", symptoms="Chest Pain,Fracture")
+    make_patient(first_name="Cal", last_name="Pike", symptoms="Dizziness")
+
+    assert sorted(names("pike", symptom="Fracture")) == ["Ann", "Ben"]
+    assert names("pike", symptom="Vomiting") == []
+
+    pages = [names("pike", limit=2, offset=offset) for offset in (0, 2, 4)]
+    assert sorted(pages[0] + pages[1]) == ["Ann", "Ben", "Cal"]
+    assert len(pages[0]) == 2 and pages[2] == []
+
+    with pytest.raises(ValueError):
+        search_patients("pike", symptom="Hiccups")
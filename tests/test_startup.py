@@ -0,0 +1,29 @@
+# tests/test_startup.py
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("nicegui")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_main_defers_route_modules(tmp_path):
+    (tmp_path / "data").mkdir()
+    code = (
+        "import sys, main; "
+        "print(sorted(m for m in ('numpy', 'queue_dashboard', 'gui.nurse_gui', "
+        "'gui.patient_gui', 'gui.status_history', 'core.queue_manager') if m in sys.modules)); "
+        "print(main.startup.report())"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=ROOT), check=True,
+    )
+
+    loaded, *report = result.stdout.strip().splitlines()[-5:]
+    assert loaded == "[]"
+    assert [line.split()[1] for line in report] == ["import", "import", "init", "total"]
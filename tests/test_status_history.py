@@ -0,0 +1,54 @@
+# tests/test_status_history.py
+
+from database import transaction
+from core.status_logger import history_page
+from tests.helpers import make_patient
+
+
+def log(pid, new_status, timestamp):
+    with transaction() as conn:
+        conn.execute(
+            "INSERT INTO status_history (patient_id, old_status, new_status, timestamp) "
+            "VALUES (?, '', ?, ?);", (pid, new_status, timestamp),
+        )
+
+
+def seed():
+    a, b = make_patient(), make_patient(first_name="Bob")
+    log(a, "Waiting Treatment", "2025-01-01T10:00:00")
+    log(b, "Waiting Treatment", "2025-01-01T10:05:00")
+    log(a, "In Treatment", "2025-01-01T10:30:00")
+    log(a, "Completed", "2025-01-02T09:30:00")
+    log(b, "Completed", "2025-01-02T11:05:00")
+    return a, b
+
+
+def walk(limit, **filters):
+    rows, cursor = [], None
+    while True:
+        page, cursor = history_page(after=cursor, limit=limit, **filters)
+        rows += page
+        if cursor is None:
+            return rows
+
+
+def test_elapsed_comes_from_lag_per_patient(temp_db):
+    a, b = seed()
+    rows = walk(2)
+
+    assert [(r["patient_id"], r["new_status"]) for r in rows] == [
+        (a, "Waiting Treatment"), (a, "In Treatment"), (a, "Completed"),
+        (b, "Waiting Treatment"), (b, "Completed"),
+    ]
+    assert [r["elapsed_seconds"] for r in rows] == [None, 1800, 82800, None, 90000]
+    assert rows[3]["full_name"] == "Bob Smith"
+
+
+def test_filters_keep_elapsed_from_full_history(temp_db):
+    a, b = seed()
+
+    completed = walk(10, status="Completed")
+    assert [(r["patient_id"], r["elapsed_seconds"]) for r in completed] == [(a, 82800), (b, 90000)]
+
+    day_one = walk(10, patient_id=a, since="2025-01-01", until="2025-01-01")
+    assert [r["new_status"] for r in day_one] == ["Waiting Treatment", "In Treatment"]
@@ -0,0 +1,44 @@
+# tests/test_status_transitions.py
+
+import pytest
+from database import get_connection, transition_status
+from tests.helpers import make_patient
+
+
+def test_transition_updates_row_and_logs_history(temp_db):
+    pid = make_patient()
+
+    row = transition_status(pid, "In Treatment", "Assigned room ER-5", room="ER-5")
+
+    assert row["status"] == "In Treatment"
+    assert row["room"] == "ER-5"
+
+    history = get_connection().execute(
+        "SELECT old_status, new_status, notes FROM status_history WHERE patient_id=?;", (pid,)
+    ).fetchall()
+    assert [tuple(h) for h in history] == [("Waiting", "In Treatment", "Assigned room ER-5")]
+
+
+def test_transition_commits_once(temp_db):
+    pid = make_patient()
+    statements = []
+    conn = get_connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        transition_status(pid, "Completed", "Discharged from ER")
+    finally:
+        conn.set_trace_callback(None)
+
+    assert sum(s.strip().upper().startswith("COMMIT") for s in statements) == 1
+
+
+def test_transition_unknown_patient(temp_db):
+    assert transition_status(12345, "Completed") is None
+    count = get_connection().execute("SELECT COUNT(*) FROM status_history;").fetchone()[0]
+    assert count == 0
+
+
+def test_transition_rejects_unknown_columns(temp_db):
+    pid = make_patient()
+    with pytest.raises(ValueError):
+        transition_status(pid, "Completed", id=99)
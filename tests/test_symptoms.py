@@ -0,0 +1,69 @@
+# tests/test_symptoms.py
+
+from core.patient import Patient
+from core.queue_manager import QueueManager
+from core.symptoms import OTHER_BIT, row_symptoms, symptom_mask, symptom_names, symptom_score
+from database import delete_patient, get_connection
+from tests.helpers import make_patient
+
+
+def test_mask_round_trip_and_score():
+    mask = symptom_mask(["Dizziness", "Chest Pain"])
+    assert symptom_names(mask) == ("Chest Pain", "Dizziness")
+    assert symptom_score(mask) == 13
+    assert symptom_mask("Chest Pain, Dizziness") == mask
+    assert symptom_mask("") == 0
+
+
+def test_free_text_symptoms_fall_back_to_the_text():
+    row = {"symptoms": "Chest Pain,Back ache", "symptom_mask": symptom_mask("Chest Pain,Back ache")}
+    assert row["symptom_mask"] & OTHER_BIT
+    assert row_symptoms(row) == ["Chest Pain", "Back ache"]
+
+
+def test_insert_fills_mask_and_join_table(temp_db):
+    pid = make_patient(symptoms="Fracture,Dizziness")
+    conn = get_connection()
+    assert conn.execute("SELECT symptom_mask FROM patients WHERE id=?", (pid,)).fetchone()[0] \
+        == symptom_mask("Fracture,Dizziness")
+    assert conn.execute("SELECT COUNT(*) FROM patient_symptoms WHERE patient_id=?", (pid,)).fetchone()[0] == 2
+
+    conn.execute("UPDATE patients SET symptom_mask=? WHERE id=?", (symptom_mask("Vomiting"), pid))
+    assert QueueManager().symptom_counts(None) == {"Vomiting": 1}
+
+    delete_patient(pid)
+    assert conn.execute("SELECT COUNT(*) FROM patient_symptoms").fetchone()[0] == 0
+
+
+def test_counts_and_filtered_pages(temp_db):
+    chest = make_patient(first_name="Chest", symptoms="Chest Pain,Dizziness")
+    make_patient(first_name="Bone", symptoms="Fracture")
+    make_patient(first_name="Treated", symptoms="Chest Pain", status="In Treatment")
+
+    qm = QueueManager()
+    assert qm.symptom_counts() == {"Chest Pain": 1, "Fracture": 1, "Dizziness": 1}
+    assert qm.symptom_counts("In Treatment") == {"Chest Pain": 1}
+
+    patients, cursor = qm.get_page(None, 10, "Waiting", symptom="Chest Pain")
+    assert [p.id for p in patients] == [chest] and cursor is None
+    assert patients[0].symptoms == ["Chest Pain", "Dizziness"]
+
+    patients, _ = qm.get_page(None, 10, None, sort="arrival", symptom="Chest Pain")
+    assert {p.first_name for p in patients} == {"Chest", "Treated"}
+
+
+def test_symptom_count_reads_the_join_table_index(temp_db):
+    plan = get_connection().execute("""
+        EXPLAIN QUERY PLAN
+        SELECT COUNT(*) FROM patient_symptoms ps JOIN patients p ON p.id = ps.patient_id
+        WHERE ps.symptom_id = 0 AND p.status = 'Waiting';
+    """).fetchall()
+    assert any("ps USING PRIMARY KEY (symptom_id=?)" in row["detail"] for row in plan)
+
+
+def test_decoders_keep_the_entered_order(temp_db):
+    pid = make_patient(symptoms="Dizziness,Chest Pain")
+    row = get_connection().execute("SELECT * FROM patients WHERE id=?", (pid,)).fetchone()
+    assert Patient.from_db_row_trusted(row).symptoms == ["Dizziness", "Chest Pain"]
+    assert Patient.from_db_row_trusted(row) == Patient.from_db_row(row)
+    assert row_symptoms(row) == ["Dizziness", "Chest Pain"]
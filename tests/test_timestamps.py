@@ -0,0 +1,73 @@
+# tests/test_timestamps.py
+
+import sqlite3
+from datetime import datetime
+
+import database
+from core.queue_manager import QueueManager
+from core.timestamps import epoch_ms, from_epoch_ms, sql_epoch_ms
+from database import get_connection, init_database, transition_status
+from tests.helpers import make_patient
+
+
+def test_text_flavours_convert_like_sqlite():
+    conn = sqlite3.connect(":memory:")
+    for text in ("2025-01-01T12:00:00", "2025-07-01T08:30:00.250000", "2025-01-01 12:00:00"):
+        in_sql = conn.execute(f"SELECT {sql_epoch_ms('?1')};", (text,)).fetchone()[0]
+        assert in_sql == epoch_ms(text)
+
+    # datetime('now') text is UTC; isoformat() text is local time
+    utc = datetime(2025, 1, 1, 12).astimezone().utcoffset()
+    assert epoch_ms("2025-01-01T12:00:00") - epoch_ms("2025-01-01 12:00:00") == -utc.total_seconds() * 1000
+    assert from_epoch_ms(epoch_ms("2025-01-01T12:00:00")) == datetime(2025, 1, 1, 12)
+
+
+def test_writers_fill_epoch_columns(temp_db):
+    pid = make_patient(arrival_time="2025-01-01T12:00:00")
+    transition_status(pid, "In Treatment", "Room ER-1", room="ER-1")
+
+    conn = get_connection()
+    assert conn.execute("SELECT arrival_ms FROM patients").fetchone()[0] == epoch_ms("2025-01-01T12:00:00")
+    row = conn.execute("SELECT timestamp, timestamp_ms FROM status_history").fetchone()
+    assert row["timestamp_ms"] == epoch_ms(row["timestamp"])
+
+
+def test_text_only_writes_are_backfilled_by_triggers(temp_db):
+    pid = make_patient()
+    conn = get_connection()
+    conn.execute("INSERT INTO status_history (patient_id, new_status, timestamp) "
+                 "VALUES (?, 'Completed', '2025-01-02 08:00:00');", (pid,))
+    conn.execute("UPDATE patients SET arrival_time='2025-01-01T06:00:00' WHERE id=?;", (pid,))
+
+    assert conn.execute("SELECT timestamp_ms FROM status_history").fetchone()[0] \
+        == epoch_ms("2025-01-02 08:00:00")
+    assert conn.execute("SELECT arrival_ms FROM patients").fetchone()[0] \
+        == epoch_ms("2025-01-01T06:00:00")
+
+
+def test_migration_backfills_legacy_text(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    legacy = sqlite3.connect(path)
+    legacy.execute("CREATE TABLE patients (id INTEGER PRIMARY KEY, first_name TEXT, "
+                   "status TEXT, arrival_time TEXT);")
+    legacy.execute("INSERT INTO patients VALUES (1, 'A', 'Waiting', '2025-01-01T09:00:00');")
+    legacy.execute("INSERT INTO patients VALUES (2, 'B', 'Waiting', '2025-01-01 09:00:00');")
+    legacy.commit()
+    legacy.close()
+
+    original = database.DB_PATH
+    database.set_database_path(path)
+    try:
+        init_database()
+        rows = get_connection().execute("SELECT arrival_time, arrival_ms FROM patients ORDER BY id").fetchall()
+        assert [r["arrival_ms"] for r in rows] == [epoch_ms(r["arrival_time"]) for r in rows]
+    finally:
+        database.set_database_path(original)
+
+
+def test_arrival_sort_reads_the_integer_index(temp_db):
+    sql, params = QueueManager()._build_query(
+        "Waiting", "arrival", None, 10, ("id",), None, nulls=False
+    )
+    plan = get_connection().execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    assert any("idx_patients_status_arrival_ms" in row["detail"] for row in plan)